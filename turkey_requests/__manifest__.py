@@ -32,7 +32,17 @@
         'views/api_delivery_orders_log_views.xml',
         'views/api_delivery_orders_update_log_views.xml',
         'views/api_sales_order_data_log_views.xml',
+        'views/api_log_retention_views.xml',
+        'views/api_metrics_rollup_views.xml',
+        'views/api_delivery_job_views.xml',
+        'views/api_dispatch_snapshot_views.xml',
+        'views/api_request_profile_views.xml',
+        'data/api_log_retention_data.xml',
+        'data/api_endpoints_data.xml',
+        'data/api_delivery_job_data.xml',
+        'data/api_dispatch_snapshot_data.xml',
     ],
+    'post_init_hook': 'post_init_hook',
     'installable': True,
     'application': False,
     'auto_install': False,
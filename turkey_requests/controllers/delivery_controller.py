@@ -5,20 +5,42 @@ _logger = logging.getLogger(__name__)
 from odoo import http
 from odoo.http import request, Response
 import json
-from datetime import datetime
+import base64
+import hashlib
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional
+from .idempotency import idempotent
+from .instrumentation import instrumented
+from ..models.stock_picking import API_DELIVERY_STATES
+from ..tools.encoding import (
+    COMPRESSION_MIN_SIZE_PARAM, DEFAULT_COMPRESSION_MIN_SIZE, compress, compress_stream, json_dumps, negotiate_encoding,
+)
+from ..tools.log_buffer import api_log_buffer
+from ..tools.serializers import DeliveryOrderSerializer, get_sale_order_keys
 
 class DeliveryControllerCustom(http.Controller):
     # Constants
-    VALID_DELIVERY_STATES = ['draft', 'waiting', 'confirmed', 'assigned', 'done', 'cancel']
+    VALID_DELIVERY_STATES = API_DELIVERY_STATES
     REQUIRED_SALE_ORDER_FIELDS = ['api_order_id', 'customer', 'products']
+    # Lookup keys of /api/sale_order_data, by priority, and the sale.order field they match
+    SALE_ORDER_LOOKUP_KEYS = {'sale_order_id': 'id', 'api_order_id': 'api_order_id', 'name': 'name'}
+    DEFAULT_PAGE_SIZE = 200
+    MAX_PAGE_SIZE = 1000
+    STREAM_BATCH_SIZE = 100
+    # Longest expected transaction, see _search_delta (Odoo's default limit_time_real)
+    DELTA_SYNC_SAFETY_LAG = timedelta(seconds=120)
     
-    def _validate_api_key(self, api_key: str) -> bool:
-        """Validate API key and return user"""
+    def _validate_api_key(self, api_key: str):
+        """Validate API key and return the id of its user, or False.
+
+        Successful validations are cached for a short time, see
+        ``res.users.apikeys._check_api_key``, so that polling devices do not
+        hit the hashed key lookup on every request.
+        """
         if not api_key:
             return False
         try:
-            return request.env['res.users.apikeys']._check_credentials(scope='rpc', key=api_key)
+            return request.env['res.users.apikeys']._check_api_key(api_key)
         except Exception as e:
             _logger.error(f"API key validation error: {str(e)}")
             return False
@@ -33,6 +55,8 @@ class DeliveryControllerCustom(http.Controller):
         """Sanitize input data"""
         if isinstance(data, dict):
             return {k: self._sanitize_input(v) for k, v in data.items()}
+        elif isinstance(data, list):
+            return [self._sanitize_input(v) for v in data]
         elif isinstance(data, str):
             return data.strip()
         return data
@@ -45,13 +69,298 @@ class DeliveryControllerCustom(http.Controller):
         if status:
             _logger.info(f"Response Status: {status}")
 
-    def _make_response(self, data: Dict[str, Any], status: int = 200) -> Response:
+    def _parse_page_size(self, limit: Optional[str]) -> int:
+        """Validate the requested page size"""
+        if limit is None:
+            return self.DEFAULT_PAGE_SIZE
+        try:
+            page_size = int(limit)
+        except ValueError:
+            raise ValueError(f"Invalid limit: {limit}")
+        if not 0 < page_size <= self.MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {self.MAX_PAGE_SIZE}")
+        return page_size
+
+    def _encode_cursor(self, scheduled_date: datetime, record_id: int) -> str:
+        """Build an opaque pagination cursor from the last returned picking"""
+        payload = json.dumps([fields.Datetime.to_string(scheduled_date), record_id])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def _decode_cursor(self, cursor: str) -> tuple:
+        """Decode a pagination cursor into its (scheduled_date, id) keyset"""
+        try:
+            scheduled_date, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return fields.Datetime.to_datetime(scheduled_date), int(record_id)
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+
+    def _delivery_orders_domain(self) -> List:
+        """Domain of the delivery orders scheduled for the current day"""
+        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        today_end = datetime.now().replace(hour=23, minute=59, second=59, microsecond=999999)
+        return [
+            ('picking_type_code', '=', 'outgoing'),
+            ('state', '=', 'delivery_assign'),
+            ('scheduled_date', '>=', today_start),
+            ('scheduled_date', '<', today_end)
+        ]
+
+    def _parse_watermark(self, since: str) -> Optional[datetime]:
+        """Parse a delta sync watermark (ISO format, microseconds kept), ``0`` asks for an initial full sync"""
+        if since in ('', '0'):
+            return None
+        try:
+            watermark = datetime.fromisoformat(since)
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid since watermark: {since}")
+        if watermark.tzinfo:
+            watermark = watermark.astimezone(timezone.utc).replace(tzinfo=None)
+        return watermark
+
+    def _search_delta(self, Picking, domain: List, since: Optional[datetime]) -> tuple:
+        """Return the pickings changed after ``since``, the removed ids and the new watermark.
+
+        A picking has changed when it or one of its moves was written after the
+        watermark. Pickings which were in the list and left it after the
+        watermark (validated, cancelled, rescheduled, deleted...) are reported
+        as removed so that clients can drop them, from the tombstones kept by
+        ``api.delivery.tombstone``.
+
+        ``write_date`` is the start time of the writing transaction, so a
+        transaction still running now may commit rows older than the latest
+        visible change. The new watermark therefore never goes past
+        ``DELTA_SYNC_SAFETY_LAG`` before the start of this request: the rows
+        changed within that lag are sent again on the next poll rather than
+        missed.
+        """
+        if since is None:
+            pickings = Picking.search(domain)
+            removed_ids = []
+        else:
+            pickings = Picking.search(domain + [
+                '|', ('write_date', '>', since), ('move_ids.write_date', '>', since)
+            ])
+            # Only the orders which were in the list, on the days it covers, before leaving it
+            removed_ids = Picking.env['api.delivery.tombstone']._get_removed_ids(
+                since, [term for term in domain if isinstance(term, tuple) and term[0] == 'scheduled_date'])
+            if removed_ids:
+                # Orders which came back to the list are sent as changed instead
+                listed_ids = set(Picking.search(domain + [('id', 'in', removed_ids)]).ids)
+                removed_ids = [picking_id for picking_id in removed_ids if picking_id not in listed_ids]
+
+        changed_dates = []
+        if pickings or removed_ids:
+            [(picking_watermark,)] = Picking._read_group([('id', 'in', pickings.ids)], [], ['write_date:max'])
+            move_domain = [('picking_id', 'in', pickings.ids)]
+            if since:
+                move_domain.append(('write_date', '>', since))
+            [(move_watermark,)] = Picking.env['stock.move']._read_group(move_domain, [], ['write_date:max'])
+            changed_dates = [picking_watermark, move_watermark]
+            if since:
+                changed_dates.append(Picking.env['api.delivery.tombstone']._get_last_removal(since))
+        latest_change = max((date for date in changed_dates if date), default=None)
+        safe_limit = Picking.env.cr.now() - self.DELTA_SYNC_SAFETY_LAG
+        watermark = min(latest_change, safe_limit) if latest_change else (since or safe_limit)
+        if since:
+            watermark = max(watermark, since)
+        return pickings, removed_ids, watermark.isoformat(sep=' ', timespec='microseconds')
+
+    def _compute_etag(self, *parts: Any) -> str:
+        """Build a weak ETag from the version fingerprint of a result set"""
+        digest = hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()
+        return f'W/"{digest}"'
+
+    def _etag_matches(self, etag: str) -> bool:
+        """Check the request If-None-Match header against ``etag`` (weak comparison)"""
+        if_none_match = request.httprequest.headers.get('If-None-Match')
+        if not if_none_match:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in candidates or etag.removeprefix('W/') in [tag.removeprefix('W/') for tag in candidates]
+
+    def _write_date_fingerprint(self, Model, domain: List) -> List:
+        """Return the record count and the latest write_date of the records matching ``domain``"""
+        [(write_date, count)] = Model._read_group(domain, [], ['write_date:max', '__count'])
+        return [count, write_date]
+
+    def _products_fingerprint(self, Model, domain: List) -> List:
+        """Version fingerprint of the product names shown for the lines of ``Model`` matching ``domain``"""
+        products = Model.env['product.product'].browse(
+            product.id for [product] in Model._read_group(domain, ['product_id']) if product)
+        return [
+            self._write_date_fingerprint(products, [('id', 'in', products.ids)]),
+            self._write_date_fingerprint(Model.env['product.template'], [('id', 'in', products.product_tmpl_id.ids)]),
+        ]
+
+    def _delivery_orders_fingerprint(self, pickings) -> List:
+        """Cheap version fingerprint of a delivery orders result, computed before serializing it.
+
+        Besides the pickings and their sale orders, it covers the partners
+        and the product names embedded in the payload.
+        """
+        env = pickings.env
+        partners = pickings.partner_id | pickings.sale_id.partner_id
+        return [
+            pickings.ids,
+            self._write_date_fingerprint(pickings, [('id', 'in', pickings.ids)]),
+            self._write_date_fingerprint(env['stock.move'], [('picking_id', 'in', pickings.ids)]),
+            self._write_date_fingerprint(env['sale.order'], [('picking_ids', 'in', pickings.ids)]),
+            self._write_date_fingerprint(env['sale.order.line'], [('order_id.picking_ids', 'in', pickings.ids)]),
+            self._write_date_fingerprint(env['res.partner'], [('id', 'in', partners.ids)]),
+            self._products_fingerprint(env['stock.move'], [('picking_id', 'in', pickings.ids)]),
+            self._products_fingerprint(env['sale.order.line'], [('order_id.picking_ids', 'in', pickings.ids)]),
+        ]
+
+    def _sale_order_fingerprint(self, sale_orders) -> List:
+        """Cheap version fingerprint of sale orders, computed before serializing them"""
+        env = sale_orders.env
+        return [
+            sale_orders.ids,
+            self._write_date_fingerprint(sale_orders, [('id', 'in', sale_orders.ids)]),
+            self._write_date_fingerprint(env['sale.order.line'], [('order_id', 'in', sale_orders.ids)]),
+            self._write_date_fingerprint(env['res.partner'], [('sale_order_ids', 'in', sale_orders.ids)]),
+            self._products_fingerprint(env['sale.order.line'], [('order_id', 'in', sale_orders.ids)]),
+            DeliveryOrderSerializer(env).languages,
+        ]
+
+    def _not_modified_response(self, etag: str) -> Response:
+        """Helper method to answer a conditional request whose ETag matches"""
+        return Response(status=304, headers=[('ETag', etag)])
+
+    def _negotiate_compression(self, body_size: Optional[int] = None) -> Optional[str]:
+        """Return the content coding to apply to the response, if any.
+
+        Bodies smaller than the configured threshold are sent as is; streamed
+        bodies (unknown size) are always compressed when the client accepts it.
+        """
+        min_size = int(request.env['ir.config_parameter'].sudo().get_param(
+            COMPRESSION_MIN_SIZE_PARAM, DEFAULT_COMPRESSION_MIN_SIZE))
+        if body_size is not None and body_size < min_size:
+            return None
+        return negotiate_encoding(request.httprequest.headers.get('Accept-Encoding'))
+
+    def _queue_log(self, model: str, vals: Dict[str, Any]) -> None:
+        """Attach an API log row to the current request.
+
+        Rows of instrumented routes are written once the route returns, with
+        the request metrics; other rows are handed over to the log writer at once.
+        """
+        log_rows = getattr(request, 'api_log_rows', None)
+        if log_rows is None:
+            self._write_api_log(model, vals)
+        else:
+            log_rows.append((model, vals))
+
+    def _record_api_metrics(self, endpoint: str, status_code: int, metrics: Dict[str, Any],
+                            log_rows: List[tuple]) -> None:
+        """Write the log rows of an instrumented request with its metrics, and its traffic sample"""
+        sample = (endpoint, fields.Datetime.now(), 'success' if status_code < 400 else 'error', metrics['duration_ms'])
+        if not log_rows and metrics.get('profile'):
+            # Keep the profile of requests which write no log row, e.g. 304 answers
+            self._write_api_log('api.request.profile', {
+                **metrics, 'timestamp': sample[1], 'endpoint': endpoint, 'status_code': status_code, 'status': sample[2],
+            }, sample)
+        elif not log_rows:
+            self._write_api_log(None, None, sample)
+        for model, vals in log_rows:
+            self._write_api_log(model, {**vals, **metrics}, sample)
+            # A request counts once in the rollups, whatever its number of log rows
+            sample = None
+
+    def _write_api_log(self, model: Optional[str], vals: Optional[Dict[str, Any]],
+                       sample: Optional[tuple] = None) -> None:
+        """Hand an API log row and/or a traffic sample over to the background log writer"""
+        env = request.env
+        if env.registry.in_test_mode():
+            # Test cursors cannot be shared with the flusher thread
+            if model:
+                env[model].sudo().create(vals)
+            if sample:
+                env['api.metrics.rollup'].sudo()._add_samples([sample])
+            return
+        api_log_buffer.append(env.cr.dbname, model, vals, sample)
+
+    def _make_response(self, data: Dict[str, Any], status: int = 200, headers: Optional[List] = None) -> Response:
         """Helper method to create consistent API responses"""
-        return Response(
-            json.dumps(data, ensure_ascii=False),
-            headers=[('Content-Type', 'application/json; charset=utf-8')],
-            status=status
+        return self._json_body_response(json_dumps(data), status, headers)
+
+    def _json_body_response(self, body: bytes, status: int = 200, headers: Optional[List] = None) -> Response:
+        """Helper method to create a response from an already encoded JSON body"""
+        headers = [('Content-Type', 'application/json; charset=utf-8'), ('Vary', 'Accept-Encoding')] + (headers or [])
+        encoding = self._negotiate_compression(len(body))
+        if encoding:
+            body = compress(body, encoding)
+            headers.append(('Content-Encoding', encoding))
+        return Response(body, headers=headers, status=status)
+
+    def _stream_response(self, chunks, status: int = 200, headers: Optional[List] = None) -> Response:
+        """Helper method to create a chunked JSON response from an iterable of bytes"""
+        headers = [('Content-Type', 'application/json; charset=utf-8'), ('Vary', 'Accept-Encoding')] + (headers or [])
+        encoding = self._negotiate_compression()
+        if encoding:
+            chunks = compress_stream(chunks, encoding)
+            headers.append(('Content-Encoding', encoding))
+        return Response(chunks, headers=headers, status=status, direct_passthrough=True)
+
+    def _stream_delivery_orders(self, registry, model: str, groups: List[tuple], extra: Dict[str, Any]):
+        """Yield the delivery orders JSON document assignee by assignee, one batch of pickings at a time.
+
+        The body is consumed after the request cursor is closed, so the
+        generator works in its own cursor. Pickings deleted in between are
+        skipped. The record cache is dropped after every batch to keep the
+        worker memory flat whatever the number of pickings.
+        """
+        with registry.cursor() as cr:
+            env = api.Environment(cr, odoo.SUPERUSER_ID, {'active_test': False})
+            Picking = env[model].sudo()
+            serializer = DeliveryOrderSerializer(env)
+            try:
+                yield b'{"orders":['
+                for group_index, (assign_to, picking_ids) in enumerate(groups):
+                    separator = b',' if group_index else b''
+                    yield separator + b'{"assign_to":' + json_dumps(assign_to) + b',"orders":['
+                    first = True
+                    for start in range(0, len(picking_ids), self.STREAM_BATCH_SIZE):
+                        batch_ids = picking_ids[start:start + self.STREAM_BATCH_SIZE]
+                        pickings_data = serializer.serialize_pickings(Picking.browse(batch_ids).exists())
+                        payloads = [json_dumps(pickings_data[picking_id])
+                                    for picking_id in batch_ids if picking_id in pickings_data]
+                        if payloads:
+                            yield (b'' if first else b',') + b','.join(payloads)
+                            first = False
+                        env.invalidate_all()
+                    yield b']}'
+                yield b'],' + json_dumps({**extra, 'status': 'success'})[1:]
+            except Exception:
+                # Headers are already sent: abort the chunked body so that the
+                # client sees an incomplete transfer rather than a 200 document
+                _logger.exception("Error while streaming delivery orders")
+                raise
+
+    def _snapshot_delivery_orders(self, env) -> Response:
+        """Serve the delivery orders of the day from the pre-serialized dispatch snapshot"""
+        Snapshot = env['api.dispatch.snapshot']
+        day = datetime.now().date()
+        etag = self._compute_etag(
+            'snapshot', self._write_date_fingerprint(Snapshot, [('day', '=', day)]),
+            DeliveryOrderSerializer(env).languages,
         )
+        if self._etag_matches(etag):
+            return self._not_modified_response(etag)
+
+        orders, total_found, assignee_count = Snapshot._render_orders(day)
+        _logger.info(f"Found {total_found} delivery orders in the dispatch snapshot")
+
+        self._queue_log('api.delivery.orders.log', {
+            'timestamp': fields.Datetime.now(),
+            'total_found': total_found,
+            'assignee_count': assignee_count,
+            'status': 'success',
+            'message': 'Fetched delivery orders successfully'
+        })
+
+        body = b'{"orders":' + orders + b',"status":"success"}'
+        return self._json_body_response(body, headers=[('ETag', etag)])
 
     def _error_response(self, message: str, status: int = 400, details: Optional[str] = None) -> Response:
         """Helper method to create error responses"""
@@ -60,12 +369,13 @@ class DeliveryControllerCustom(http.Controller):
             data['details'] = details
         return self._make_response(data, status)
 
-    def _success_response(self, data: Dict[str, Any], status: int = 200) -> Response:
+    def _success_response(self, data: Dict[str, Any], status: int = 200, headers: Optional[List] = None) -> Response:
         """Helper method to create success responses"""
         data['status'] = 'success'
-        return self._make_response(data, status)
+        return self._make_response(data, status, headers)
 
     @http.route('/api/test', auth="api_key", type='http', methods=['GET'], csrf=False)
+    @instrumented('/api/test')
     def test_endpoint(self, **kw):
         """Test endpoint to verify module is loading"""
         try:
@@ -76,8 +386,22 @@ class DeliveryControllerCustom(http.Controller):
             return self._error_response('Internal Server Error', status=500, details=str(e))
 
     @http.route('/api/delivery_orders', auth="api_key", type='http', methods=['GET'], csrf=False)
-    def api_get_delivery_orders(self, model='stock.picking', values=None, context=None, token=None, **kw):
-        """Get delivery orders for the current day"""
+    @instrumented('/api/delivery_orders')
+    def api_get_delivery_orders(self, model='stock.picking', values=None, context=None, token=None,
+                                limit=None, cursor=None, since=None, stream=None, **kw):
+        """Get delivery orders for the current day.
+
+        Passing ``limit`` and/or ``cursor`` switches to keyset pagination on
+        ``(scheduled_date, id)``: the response then holds one page of orders,
+        grouped by assignee, and the ``next_cursor`` of the following page.
+
+        Passing ``since`` switches to delta sync: only the orders changed after
+        that ``write_date`` watermark are returned, together with the ids of the
+        orders that left the list and the watermark to use on the next poll.
+
+        Passing ``stream=1`` sends the same JSON document as a chunked response
+        built batch by batch, so the payload is never held in memory at once.
+        """
         try:
             self._log_api_call('/api/delivery_orders', 'GET')
 
@@ -90,78 +414,95 @@ class DeliveryControllerCustom(http.Controller):
                 return self._error_response('Invalid API key', status=401)
 
             env = api.Environment(request.cr, odoo.SUPERUSER_ID, {'active_test': False})
+            domain = self._delivery_orders_domain()
+
+            paginate = limit is not None or cursor is not None
+            delta = since is not None
+            if delta:
+                if paginate:
+                    return self._error_response('since cannot be combined with limit or cursor')
+                try:
+                    since = self._parse_watermark(since)
+                except ValueError as e:
+                    return self._error_response(str(e))
+                pickings, removed_ids, watermark = self._search_delta(env[model].sudo(), domain, since)
+            elif paginate:
+                try:
+                    page_size = self._parse_page_size(limit)
+                    after = self._decode_cursor(cursor) if cursor else None
+                except ValueError as e:
+                    return self._error_response(str(e))
+
+                if after:
+                    after_date, after_id = after
+                    domain += ['|', ('scheduled_date', '>', after_date),
+                               '&', ('scheduled_date', '=', after_date), ('id', '>', after_id)]
+
+                # Fetch one extra record to know whether another page follows
+                pickings = env[model].sudo().search(domain, order='scheduled_date, id', limit=page_size + 1)
+                next_cursor = None
+                if len(pickings) > page_size:
+                    pickings = pickings[:page_size]
+                    next_cursor = self._encode_cursor(pickings[-1].scheduled_date, pickings[-1].id)
+            elif model == 'stock.picking' and stream not in ('1', 'true') and env['api.dispatch.snapshot']._is_enabled():
+                return self._snapshot_delivery_orders(env)
+            else:
+                pickings = env[model].sudo().search(domain)
 
-            # Get today's date range
-            today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            today_end = datetime.now().replace(hour=23, minute=59, second=59, microsecond=999999)
-
-            # Search for delivery orders
-            pickings = env[model].sudo().search([
-                ('picking_type_code', '=', 'outgoing'),
-                ('state', '=', 'delivery_assign'),
-                ('scheduled_date', '>=', today_start),
-                ('scheduled_date', '<', today_end)
-            ])
+            _logger.info(f"Found {len(pickings)} delivery orders")
 
-            pickings.mapped('partner_id')
-            pickings.mapped('sale_id')
-            pickings.mapped('move_ids.product_id')
+            serializer = DeliveryOrderSerializer(env)
 
-            _logger.info(f"Found {len(pickings)} delivery orders")
+            # Answer unchanged polls before building any payload
+            etag = self._compute_etag(
+                self._delivery_orders_fingerprint(pickings),
+                serializer.languages,
+                next_cursor if paginate else None,
+                [removed_ids, watermark] if delta else None,
+            )
+            if self._etag_matches(etag):
+                return self._not_modified_response(etag)
 
-            # Group orders by assignee
-            orders = []
-            assignees = set(pickings.filtered(lambda x: x.assign_to).mapped('assign_to'))
-
-            for assign in assignees:
-                assign_dict = {
-                    'assign_to': assign.delivery_id if assign else None,
-                    'orders': []
-                }
-
-                for picking in pickings.filtered(lambda x: x.assign_to.id == assign.id):
-                    _logger.info(f"Processing picking: {picking.name}")
-                    sale_order = picking.sale_id
-
-                    sale_order_data = None
-                    if sale_order:
-                        sale_order_data = self._prepare_sale_order_data(sale_order)
-
-                    picking_data = {
-                        'id': picking.id,
-                        'name': picking.name,
-                        'partner': picking.partner_id.name,
-                        'longitude': picking.long,
-                        'latitude': picking.lat,
-                        'delivery_state': picking.state,
-                        'move_lines': [{
-                            'product_id': line.product_id.id,
-                            'product_name': line.product_id.name,
-                            'product_name_arabic': line.product_id.with_context(lang='ar_001').name,
-                            'quantity': line.product_uom_qty
-                        } for line in picking.move_ids],
-                        'sale_order': sale_order_data
-                    }
-
-                    assign_dict['orders'].append(picking_data)
-                orders.append(assign_dict)
+            groups = serializer.group_ids_by_assignee(pickings)
+            assignee_count = len([assign_to for assign_to, picking_ids in groups if assign_to is not None])
 
             # ✅ Log success in api.delivery.orders.log
-            request.env['api.delivery.orders.log'].sudo().create({
+            self._queue_log('api.delivery.orders.log', {
                 'timestamp': fields.Datetime.now(),
                 'total_found': len(pickings),
-                'assignee_count': len(assignees),
+                'assignee_count': assignee_count,
                 'status': 'success',
                 'message': 'Fetched delivery orders successfully'
             })
 
-            return self._success_response({'orders': orders})
+            extra = {}
+            if paginate:
+                extra['next_cursor'] = next_cursor
+            if delta:
+                extra['removed'] = removed_ids
+                extra['watermark'] = watermark
+
+            if stream in ('1', 'true'):
+                return self._stream_response(
+                    self._stream_delivery_orders(env.registry, model, groups, extra),
+                    headers=[('ETag', etag)],
+                )
+
+            # Serialize all pickings at once, then assemble the assignee groups
+            pickings_data = serializer.serialize_pickings(pickings)
+            orders = [{
+                'assign_to': assign_to,
+                'orders': [pickings_data[picking_id] for picking_id in picking_ids],
+            } for assign_to, picking_ids in groups]
+
+            result = {'orders': orders, **extra}
+            return self._success_response(result, headers=[('ETag', etag)])
 
         except Exception as e:
             _logger.error(f"Error while processing delivery orders: {str(e)}")
 
             # ✅ Log failure in api.delivery.orders.log
-            request.env['api.delivery.orders.log'].sudo().create({
+            self._queue_log('api.delivery.orders.log', {
                 'timestamp': fields.Datetime.now(),
                 'total_found': 0,
                 'assignee_count': 0,
@@ -172,6 +513,8 @@ class DeliveryControllerCustom(http.Controller):
             return self._error_response('Internal Server Error', status=500, details=str(e))
 
     @http.route('/api/update_delivery_orders', auth="api_key", type='http', methods=['POST'], csrf=False)
+    @instrumented('/api/update_delivery_orders')
+    @idempotent('/api/update_delivery_orders')
     def api_update_delivery_orders(self, **kwargs):
         """Update delivery orders to a specified state"""
         try:
@@ -182,7 +525,8 @@ class DeliveryControllerCustom(http.Controller):
             if not api_key:
                 return self._error_response('API key is missing', status=401)
 
-            if not self._validate_api_key(api_key):
+            uid = self._validate_api_key(api_key)
+            if not uid:
                 return self._error_response('Invalid API key', status=401)
 
             # Parse and validate input data
@@ -193,6 +537,14 @@ class DeliveryControllerCustom(http.Controller):
             except json.JSONDecodeError:
                 return self._error_response('Invalid JSON data')
 
+            # Async mode: queue the update and report it through /api/delivery_jobs/<job_id>
+            if data.get('async'):
+                return self._enqueue_delivery_orders_update(data, uid)
+
+            # Bulk mode: a list of {id, state} items with per-order results
+            if 'items' in data:
+                return self._bulk_update_delivery_orders(data['items'])
+
             # Validate required fields
             if not data.get('delivery_order_ids'):
                 return self._error_response('Missing required field: delivery_order_ids')
@@ -223,7 +575,7 @@ class DeliveryControllerCustom(http.Controller):
             _logger.info(f"Updated {len(delivery_orders)} delivery orders to '{state}' state")
 
             # ✅ Log success
-            request.env['api.delivery.orders.update.log'].sudo().create({
+            self._queue_log('api.delivery.orders.update.log', {
                 'timestamp': datetime.now(),
                 'updated_count': len(delivery_orders),
                 'target_state': state,
@@ -248,7 +600,7 @@ class DeliveryControllerCustom(http.Controller):
 
             # ✅ Log error
             try:
-                request.env['api.delivery.orders.update.log'].sudo().create({
+                self._queue_log('api.delivery.orders.update.log', {
                     'timestamp': datetime.now(),
                     'updated_count': 0,
                     'target_state': data.get('state') if 'data' in locals() else None,
@@ -263,45 +615,209 @@ class DeliveryControllerCustom(http.Controller):
 
             return self._error_response('Internal Server Error', status=500, details=str(e))
 
-    # def _prepare_sale_order_data(self, sale_order) -> Dict[str, Any]:
-    #     """Helper method to prepare sale order data"""
-    #     return {
-    #         'id': sale_order.id,
-    #         'name': sale_order.name,
-    #         'city': sale_order.city,
-    #         'order': sale_order.api_order_id,
-    #         'delivery_time': sale_order.delivery_time,
-    #         'payment_method': sale_order.payment_method,
-    #         'payment_status': sale_order.payment_status,
-    #         'delivery_period': sale_order.delivery_period,
-    #         'api_order_id': sale_order.api_order_id,
-    #         'date_order': sale_order.date_order.isoformat() if sale_order.date_order else None,
-    #         'partner_id': {
-    #             'id': sale_order.partner_id.id,
-    #             'name': sale_order.partner_id.name,
-    #             'phone': sale_order.partner_id.phone,
-    #             'address': sale_order.partner_id.street,
-    #             'state': sale_order.partner_id.state_id.name,
-    #             'city': sale_order.partner_id.city,
-    #             'country': sale_order.partner_id.country_id.name,
-    #         },
-    #         'state': sale_order.state,
-    #         'amount_total': sale_order.amount_total,
-    #         'order_lines': [{
-    #             'product_id': line.product_id.id,
-    #             'product_name': line.product_id.name,
-    #             'product_name_arabic': line.product_id.with_context(lang='ar_001').name,
-    #             'quantity': line.product_uom_qty,
-    #             'price_unit': line.price_unit,
-    #             'size': line.size,
-    #             'cut': line.cutting,
-    #             'preparation': line.preparation,
-    #             'shalwata': line.shalwata,
-    #             'subtotal': line.price_subtotal
-    #         } for line in sale_order.order_line]
-    #     }
+    def _bulk_update_delivery_orders(self, items: Any) -> Response:
+        """Apply mixed state transitions and report the outcome of every item"""
+        if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+            return self._error_response('items must be a non-empty list of {"id", "state"} objects')
+
+        results = request.env['stock.picking'].sudo()._api_apply_state_transitions(
+            items, valid_states=self.VALID_DELIVERY_STATES)
+        succeeded = [result['id'] for result in results if result['success']]
+        failed = len(results) - len(succeeded)
+        states = {result['state'] for result in results}
+        target_state = states.pop() if len(states) == 1 else False
+        _logger.info(f"Bulk update of {len(results)} delivery orders: {len(succeeded)} succeeded, {failed} failed")
+
+        self._queue_log('api.delivery.orders.update.log', {
+            'timestamp': datetime.now(),
+            'updated_count': len(succeeded),
+            'failed_count': failed,
+            'target_state': target_state if target_state in self.VALID_DELIVERY_STATES else False,
+            'delivery_order_ids': ','.join(str(item.get('id')) for item in items),
+            'status': 'error' if failed else 'success',
+            'message': f"Bulk update: {len(succeeded)} succeeded, {failed} failed",
+        })
+
+        return self._success_response({
+            'message': f'{len(succeeded)} delivery orders updated, {failed} failed',
+            'succeeded': len(succeeded),
+            'failed': failed,
+            'results': results,
+        })
+
+    def _enqueue_delivery_orders_update(self, data: Dict[str, Any], uid: int) -> Response:
+        """Queue a delivery orders update as a background job owned by ``uid`` and answer 202 with its id.
+
+        The payload is validated like the synchronous path before anything is
+        queued, so malformed requests get a 400 instead of a job that fails.
+        """
+        if 'items' in data:
+            items = data['items']
+            if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+                return self._error_response('items must be a non-empty list of {"id", "state"} objects')
+        else:
+            if not data.get('delivery_order_ids'):
+                return self._error_response('Missing required field: delivery_order_ids')
+            if not data.get('state'):
+                return self._error_response('Missing required field: state')
+            if not isinstance(data['delivery_order_ids'], list):
+                return self._error_response('delivery_order_ids must be a list')
+            items = [{'id': order_id, 'state': data['state']} for order_id in data['delivery_order_ids']]
+
+        queued_items = []
+        for item in items:
+            order_id, state = item.get('id'), item.get('state')
+            if isinstance(order_id, str) and order_id.isdigit():
+                order_id = int(order_id)
+            if not isinstance(order_id, int) or isinstance(order_id, bool):
+                return self._error_response(f"Invalid id: {item.get('id')}")
+            if state not in self.VALID_DELIVERY_STATES:
+                return self._error_response(f'Invalid state: {state}')
+            queued_items.append({'id': order_id, 'state': state})
+        items = queued_items
+
+        job = request.env['api.delivery.job']._enqueue(items, uid)
+        status_url = f'/api/delivery_jobs/{job.id}'
+        _logger.info(f"Queued the update of {len(items)} delivery orders as job {job.id}")
+
+        self._queue_log('api.delivery.orders.update.log', {
+            'timestamp': datetime.now(),
+            'updated_count': 0,
+            'delivery_order_ids': ','.join(str(item.get('id')) for item in items),
+            'status': 'success',
+            'message': f"Queued as job {job.id}",
+        })
+
+        return self._success_response({
+            'message': f'Update of {len(items)} delivery orders queued',
+            'job_id': job.id,
+            'status_url': status_url,
+        }, status=202, headers=[('Location', status_url)])
+
+    @http.route('/api/delivery_jobs/<int:job_id>', auth="api_key", type='http', methods=['GET'], csrf=False)
+    @instrumented('/api/delivery_jobs')
+    def api_get_delivery_job(self, job_id, **kwargs):
+        """Report the progress and the per-order outcomes of a queued delivery orders update"""
+        try:
+            self._log_api_call('/api/delivery_jobs', 'GET')
+
+            api_key = request.httprequest.headers.get('Authorization')
+            if not api_key:
+                return self._error_response('API key is missing', status=401)
+
+            uid = self._validate_api_key(api_key)
+            if not uid:
+                return self._error_response('Invalid API key', status=401)
+
+            # Jobs of other API users are reported as missing rather than forbidden
+            job = request.env['api.delivery.job'].sudo().browse(job_id).exists()
+            if not job or job.user_id.id != uid:
+                return self._error_response('Job not found', status=404)
+
+            return self._success_response(job._get_status_data())
+
+        except Exception as e:
+            _logger.error(f"Error while reading delivery orders job {job_id}: {str(e)}")
+            return self._error_response('Internal Server Error', status=500, details=str(e))
+
+    def _find_sale_orders(self, SaleOrder, key: str, identifiers: List[Any]) -> Dict[Any, Any]:
+        """Resolve identifiers of one lookup key with a single search, keyed by input identifier.
+
+        When several orders share an identifier, the first one in the default
+        order of sale orders wins, as with the former ``search(limit=1)``.
+        """
+        field_name = self.SALE_ORDER_LOOKUP_KEYS[key]
+        search_values = {}
+        for identifier in identifiers:
+            if isinstance(identifier, bool) or not isinstance(identifier, (int, str)):
+                continue
+            if field_name == 'id':
+                if str(identifier).isdigit():
+                    search_values[identifier] = int(identifier)
+            else:
+                search_values[identifier] = str(identifier)
+        if not search_values:
+            return {}
+
+        if field_name == 'api_order_id':
+            # Exact-match fast path on the api_order_id index, without the ORM search overhead
+            by_value = SaleOrder._api_find_by_api_order_ids(search_values.values())
+        else:
+            orders = SaleOrder.search([(field_name, 'in', list(set(search_values.values())))])
+            rows = [{'id': order_id} for order_id in orders.ids] if field_name == 'id' else orders.read([field_name], load=None)
+            by_value = {}
+            for row in rows:
+                by_value.setdefault(row[field_name], row['id'])
+        return {
+            identifier: SaleOrder.browse(by_value[value])
+            for identifier, value in search_values.items() if value in by_value
+        }
+
+    def _batch_sale_order_data(self, SaleOrder, data: Dict[str, Any], projection: Optional[List[str]] = None) -> Response:
+        """Serve a batch lookup: results keyed by lookup key and identifier, plus the identifiers not found"""
+        found = {}
+        not_found = {}
+        for key in self.SALE_ORDER_LOOKUP_KEYS:
+            if key not in data:
+                continue
+            identifiers = data[key] if isinstance(data[key], list) else [data[key]]
+            found[key] = self._find_sale_orders(SaleOrder, key, identifiers)
+            not_found[key] = [
+                identifier for identifier in identifiers
+                if not isinstance(identifier, (int, str)) or identifier not in found[key]
+            ]
+        if not found:
+            return self._error_response("Please provide one of: sale_order_id, api_order_id, or name")
+
+        sale_orders = SaleOrder.browse({order.id for orders in found.values() for order in orders.values()})
+        etag = self._compute_etag(
+            {key: list(orders) for key, orders in found.items()}, not_found, self._sale_order_fingerprint(sale_orders),
+            projection,
+        )
+        if self._etag_matches(etag):
+            return self._not_modified_response(etag)
+
+        payloads = self._prepare_sale_order_data(sale_orders, projection)
+        missing_count = sum(len(identifiers) for identifiers in not_found.values())
+
+        self._queue_log('api.sale.order.data.log', {
+            'timestamp': datetime.now(),
+            'sale_order_id': sale_orders[:1].id if len(sale_orders) == 1 else False,
+            'status': 'success',
+            'message': f"Batch lookup: {len(sale_orders)} sale orders found, {missing_count} identifiers not found",
+        })
+
+        return self._success_response({
+            'sale_orders': {
+                key: {str(identifier): payloads[order.id] for identifier, order in orders.items()}
+                for key, orders in found.items()
+            },
+            'not_found': not_found,
+        }, headers=[('ETag', etag)])
+
+    def _prepare_sale_order_data(self, sale_orders,
+                                 payload_fields: Optional[List[str]] = None) -> Dict[int, Dict[str, Any]]:
+        """Helper method to prepare the data of a sale order recordset, keyed by sale order id.
+
+        Partners, states, countries, order lines and products are read once
+        for the whole recordset. ``payload_fields`` restricts the payload to
+        these keys (``id`` is always included), and skips reading the partner
+        address or the order lines when they are not requested.
+        """
+        return DeliveryOrderSerializer(sale_orders.env).serialize_sale_orders(sale_orders, payload_fields)
+
+    def _parse_sale_order_fields(self, data: Dict[str, Any]) -> Optional[List[str]]:
+        """Read the optional ``fields`` projection of a request, as a list or a comma-separated string"""
+        projection = data.get('fields')
+        if isinstance(projection, str):
+            projection = [name.strip() for name in projection.split(',') if name.strip()]
+        if projection is not None and not (
+                isinstance(projection, list) and all(isinstance(name, str) for name in projection)):
+            raise ValueError('fields must be a list of field names')
+        return projection or None
 
     @http.route('/api/sale_order_data', auth="api_key", type='http', methods=['POST'], csrf=False)
+    @instrumented('/api/sale_order_data')
     def api_get_sale_order_data(self, **kwargs):
         try:
             self._log_api_call('/api/sale_order_data', 'POST')
@@ -318,42 +834,48 @@ class DeliveryControllerCustom(http.Controller):
             except json.JSONDecodeError:
                 return self._error_response('Invalid JSON data')
 
-            sale_order = None
             SaleOrder = request.env['sale.order'].sudo()
-
-            # Try by sale_order_id
-            if data.get('sale_order_id'):
-                sale_order = SaleOrder.search([('id', '=', data['sale_order_id'])], limit=1)
-            # Try by api_order_id
-            elif data.get('api_order_id'):
-                sale_order = SaleOrder.search([('api_order_id', '=', data['api_order_id'])], limit=1)
-            # Try by name
-            elif data.get('name'):
-                sale_order = SaleOrder.search([('name', '=', data['name'])], limit=1)
-            else:
+            try:
+                projection = self._parse_sale_order_fields(data)
+                get_sale_order_keys(projection)
+            except ValueError as e:
+                return self._error_response(str(e))
+
+            # Batch mode: lists of identifiers, resolved with one search per lookup key
+            if any(isinstance(data.get(key), list) for key in self.SALE_ORDER_LOOKUP_KEYS):
+                return self._batch_sale_order_data(SaleOrder, data, projection)
+
+            # Try by sale_order_id, then api_order_id, then name
+            key = next((key for key in self.SALE_ORDER_LOOKUP_KEYS if data.get(key)), None)
+            if not key:
                 return self._error_response("Please provide one of: sale_order_id, api_order_id, or name")
 
+            sale_order = next(iter(self._find_sale_orders(SaleOrder, key, [data[key]]).values()), None)
             if not sale_order:
                 return self._error_response("Sale Order not found", status=404)
 
-            sale_order_data = self._prepare_sale_order_data(sale_order)
+            etag = self._compute_etag(self._sale_order_fingerprint(sale_order), projection)
+            if self._etag_matches(etag):
+                return self._not_modified_response(etag)
+
+            sale_order_data = self._prepare_sale_order_data(sale_order, projection)[sale_order.id]
 
             # ✅ Log success
-            request.env['api.sale.order.data.log'].sudo().create({
+            self._queue_log('api.sale.order.data.log', {
                 'timestamp': datetime.now(),
                 'sale_order_id': sale_order.id,
                 'status': 'success',
                 'message': f"Sale Order fetched successfully"
             })
 
-            return self._success_response({'sale_order': sale_order_data})
+            return self._success_response({'sale_order': sale_order_data}, headers=[('ETag', etag)])
 
         except Exception as e:
             _logger.error(f"Error fetching sale order data: {str(e)}")
 
             # ✅ Log error
             try:
-                request.env['api.sale.order.data.log'].sudo().create({
+                self._queue_log('api.sale.order.data.log', {
                     'timestamp': datetime.now(),
                     'sale_order_id': data.get('sale_order_id') or None,
                     'status': 'error',
@@ -0,0 +1,55 @@
+import functools
+import hashlib
+from odoo.http import request
+from ..tools.encoding import decompress
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+def idempotent(endpoint: str):
+    """Replay the stored response of a request sent again with the same ``Idempotency-Key`` header.
+
+    Keys are scoped to the endpoint and to the user of the API key. The first
+    request with a key runs the route and its response is stored; retries get
+    the stored response back without running the route again, and a retry
+    sent while the first request is still running waits for it on the row
+    lock of the key. On server errors the transaction is rolled back, which
+    drops both the key and any partial work of the route, so they can be
+    retried safely.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = request.httprequest.headers.get(IDEMPOTENCY_HEADER)
+            if not key:
+                return method(self, *args, **kwargs)
+            if len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+                return self._error_response(f'{IDEMPOTENCY_HEADER} is too long')
+            uid = self._validate_api_key(request.httprequest.headers.get('Authorization'))
+            if not uid:
+                # Let the route answer the authentication error
+                return method(self, *args, **kwargs)
+
+            request_hash = hashlib.sha256(request.httprequest.get_data()).hexdigest()
+            record = request.env['api.idempotency.key'].sudo()._acquire(endpoint, uid, key)
+            if record.request_hash and record.request_hash != request_hash:
+                return self._error_response(
+                    f'{IDEMPOTENCY_HEADER} was already used with a different request body', status=422)
+            if record.status_code:
+                return self._json_body_response(
+                    record.response_body.encode(), record.status_code, [('Idempotent-Replayed', 'true')])
+
+            response = method(self, *args, **kwargs)
+            if response.status_code >= 500:
+                request.env.cr.rollback()
+            else:
+                body = decompress(response.get_data(), response.headers.get('Content-Encoding'))
+                record.write({
+                    'request_hash': request_hash,
+                    'status_code': response.status_code,
+                    'response_body': body.decode(),
+                })
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,82 @@
+import functools
+import random
+import threading
+import time
+from typing import Optional, Tuple
+from odoo.http import request
+from ..tools.profiler import (
+    DEFAULT_PROFILER_INTERVAL_MS, DEFAULT_PROFILER_THRESHOLD_MS, PROFILER_ENABLED_PARAM, PROFILER_INTERVAL_PARAM,
+    PROFILER_SAMPLE_RATE_PARAM, PROFILER_THRESHOLD_PARAM, StackSampler,
+)
+
+
+def _thread_sql_counters() -> tuple:
+    """Return the (query count, query time in seconds) tracked by Odoo on the current thread"""
+    thread = threading.current_thread()
+    return getattr(thread, 'query_count', 0), getattr(thread, 'query_time', 0.0)
+
+
+def _start_profiler() -> Tuple[Optional[StackSampler], bool, float]:
+    """Start profiling the current request if the profiler is enabled.
+
+    Returns the running sampler (None when the request is not profiled),
+    whether the request was picked by the sample rate and the latency
+    threshold (ms) above which its profile is kept.
+    """
+    get_param = request.env['ir.config_parameter'].sudo().get_param
+    if get_param(PROFILER_ENABLED_PARAM, 'False').lower() not in ('1', 'true'):
+        return None, False, 0.0
+    threshold_ms = float(get_param(PROFILER_THRESHOLD_PARAM, DEFAULT_PROFILER_THRESHOLD_MS))
+    sampled = random.random() < float(get_param(PROFILER_SAMPLE_RATE_PARAM, 0.0))
+    if not sampled and threshold_ms <= 0:
+        return None, False, 0.0
+    interval = float(get_param(PROFILER_INTERVAL_PARAM, DEFAULT_PROFILER_INTERVAL_MS)) / 1000
+    return StackSampler(threading.get_ident(), interval).start(), sampled, threshold_ms
+
+
+def instrumented(endpoint: str):
+    """Measure a controller route and record its metrics.
+
+    Wall time, SQL time, query count and response size are added to the API
+    log rows queued by the route through ``_queue_log``, a sample is folded
+    into the traffic metrics rollups and the timings are exposed in a
+    ``Server-Timing`` response header.
+
+    When the profiler is enabled, the stacks of the request are sampled and
+    the profile is attached to its log rows if the request is slower than
+    the threshold or was picked by the sample rate, or stored as an
+    ``api.request.profile`` when the request writes no log row. Streamed bodies are
+    produced after the route returns and are not part of the profile.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            request.api_log_rows = []
+            query_count, query_time = _thread_sql_counters()
+            profiler, sampled, threshold_ms = _start_profiler()
+            started = time.monotonic()
+            try:
+                response = method(self, *args, **kwargs)
+            finally:
+                if profiler:
+                    profiler.stop()
+            duration_ms = (time.monotonic() - started) * 1000
+            end_query_count, end_query_time = _thread_sql_counters()
+            metrics = {
+                'duration_ms': duration_ms,
+                'db_time_ms': (end_query_time - query_time) * 1000,
+                'query_count': end_query_count - query_count,
+                # Unknown (None) for streamed responses
+                'response_size': response.calculate_content_length(),
+            }
+            if profiler and (sampled or 0 < threshold_ms <= duration_ms):
+                metrics['profile'] = profiler.report()
+            self._record_api_metrics(endpoint, response.status_code, metrics, request.api_log_rows)
+            response.headers['Server-Timing'] = (
+                f'app;dur={metrics["duration_ms"]:.1f}, '
+                f'db;dur={metrics["db_time_ms"]:.1f};desc="{metrics["query_count"]} queries"'
+            )
+            return response
+        return wrapper
+    return decorator
+
@@ -0,0 +1,16 @@
+import logging
+
+from .tools.indexes import check_indexes
+
+_logger = logging.getLogger(__name__)
+
+
+def post_init_hook(env):
+    """Report the indexes the API lookups rely on that could not be created.
+
+    Scan counters are still empty at this point, index usage is reported
+    later by the weekly cron and the "Check API Indexes" server action.
+    """
+    report = check_indexes(env.cr)
+    if report['missing']:
+        _logger.warning("Missing indexes for the delivery orders API: %s", ', '.join(report['missing']))
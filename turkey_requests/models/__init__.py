@@ -1,4 +1,20 @@
+from . import api_log_metrics_mixin
 from . import api_endpoints
 from . import api_delivery_orders_log
 from . import api_delivery_orders_update_log
-from . import api_sale_order_data_log
\ No newline at end of file
+from . import api_sale_order_data_log
+from . import api_log_retention
+from . import api_metrics_rollup
+from . import ir_config_parameter
+from . import product_template
+from . import res_partner
+from . import res_users_apikeys
+from . import sale_order
+from . import sale_order_line
+from . import stock_move
+from . import stock_picking
+from . import api_delivery_job
+from . import api_idempotency_key
+from . import api_dispatch_snapshot
+from . import api_delivery_tombstone
+from . import api_request_profile
@@ -0,0 +1,125 @@
+import json
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Dict, List
+from odoo import models, fields, api
+from .stock_picking import API_DELIVERY_STATES, STATE_TRANSITION_CHUNK_SIZE
+
+_logger = logging.getLogger(__name__)
+
+# Wall time (seconds) a cron run spends on jobs before handing over to the next run
+JOB_TIME_BUDGET = 60
+# Finished jobs are deleted after this number of days
+JOB_RETENTION_DAYS = 7
+
+
+class ApiDeliveryJob(models.Model):
+    _name = 'api.delivery.job'
+    _description = 'Delivery Orders Update Job'
+    _order = 'id desc'
+
+    state = fields.Selection([
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', default='queued', required=True, index=True)
+    user_id = fields.Many2one('res.users', string='Requested By', readonly=True, index=True, ondelete='cascade')
+    items = fields.Json(string='Items', required=True)
+    results = fields.Json(string='Results', default=list)
+    total_count = fields.Integer(string='Orders', readonly=True)
+    processed_count = fields.Integer(string='Processed', default=0, readonly=True)
+    failed_count = fields.Integer(string='Failed', default=0, readonly=True)
+    progress = fields.Float(string='Progress (%)', compute='_compute_progress')
+    results_display = fields.Text(string='Results', compute='_compute_results_display')
+    date_started = fields.Datetime(string='Started', readonly=True)
+    date_done = fields.Datetime(string='Finished', readonly=True)
+    error = fields.Text(string='Error', readonly=True)
+
+    @api.depends('total_count', 'processed_count')
+    def _compute_progress(self):
+        for job in self:
+            job.progress = job.processed_count * 100 / job.total_count if job.total_count else 100.0
+
+    @api.depends('results')
+    def _compute_results_display(self):
+        for job in self:
+            job.results_display = '\n'.join(json.dumps(result) for result in job.results or [])
+
+    @api.model
+    def _enqueue(self, items: List[Dict[str, Any]], user_id: int) -> 'ApiDeliveryJob':
+        """Queue the ``{'id', 'state'}`` transitions of ``items`` on behalf of ``user_id`` and wake up the job worker"""
+        job = self.sudo().create({'items': items, 'total_count': len(items), 'user_id': user_id})
+        self.env.ref('turkey_requests.ir_cron_api_delivery_jobs').sudo()._trigger()
+        return job
+
+    def _get_status_data(self) -> Dict[str, Any]:
+        """Return the progress and per-order outcomes reported by the job status endpoint"""
+        self.ensure_one()
+        return {
+            'job_id': self.id,
+            'job_state': self.state,
+            'total': self.total_count,
+            'processed': self.processed_count,
+            'failed': self.failed_count,
+            'progress': round(self.progress, 1),
+            'date_started': self.date_started.isoformat() if self.date_started else None,
+            'date_done': self.date_done.isoformat() if self.date_done else None,
+            'error': self.error or None,
+            'results': self.results or [],
+        }
+
+    def _lock_next_job(self) -> 'ApiDeliveryJob':
+        """Lock and return the oldest pending job not being processed by another worker"""
+        self.flush_model(['state'])
+        self.env.cr.execute("""
+            SELECT id
+              FROM api_delivery_job
+             WHERE state IN ('queued', 'running')
+          ORDER BY id
+             LIMIT 1
+               FOR UPDATE SKIP LOCKED
+        """)
+        row = self.env.cr.fetchone()
+        return self.browse(row[0] if row else [])
+
+    def _process_chunk(self) -> None:
+        """Apply the next chunk of items of the job and store their results"""
+        self.ensure_one()
+        if self.state == 'queued':
+            self.write({'state': 'running', 'date_started': fields.Datetime.now()})
+        items = self.items[self.processed_count:self.processed_count + STATE_TRANSITION_CHUNK_SIZE]
+        results = self.env['stock.picking'].sudo()._api_apply_state_transitions(items, valid_states=API_DELIVERY_STATES)
+        vals = {
+            'results': (self.results or []) + results,
+            'processed_count': self.processed_count + len(items),
+            'failed_count': self.failed_count + sum(not result['success'] for result in results),
+        }
+        if vals['processed_count'] >= self.total_count:
+            vals.update(state='done', date_done=fields.Datetime.now())
+        self.write(vals)
+
+    @api.model
+    def _cron_process_jobs(self):
+        """Process the pending jobs chunk by chunk, committing after every chunk"""
+        started = time.monotonic()
+        while time.monotonic() - started < JOB_TIME_BUDGET:
+            job = self._lock_next_job()
+            if not job:
+                break
+            try:
+                with self.env.cr.savepoint():
+                    job._process_chunk()
+            except Exception as e:
+                _logger.exception("Delivery orders job %s failed", job.id)
+                job.write({'state': 'failed', 'error': str(e), 'date_done': fields.Datetime.now()})
+            if not self.env.registry.in_test_mode():
+                self.env.cr.commit()
+        else:
+            # Time budget exhausted, let another run pick up the remaining chunks
+            self.env.ref('turkey_requests.ir_cron_api_delivery_jobs')._trigger()
+        self.search([
+            ('state', 'in', ('done', 'failed')),
+            ('date_done', '<', fields.Datetime.now() - timedelta(days=JOB_RETENTION_DAYS)),
+        ]).unlink()
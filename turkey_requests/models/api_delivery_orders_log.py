@@ -3,14 +3,15 @@ from odoo import models, fields
 
 class DeliveryOrdersLog(models.Model):
     _name = 'api.delivery.orders.log'
+    _inherit = ['api.log.metrics.mixin']
     _description = 'Delivery Orders API Log'
     _order = 'timestamp desc'
 
-    timestamp = fields.Datetime(string='Timestamp', default=fields.Datetime.now)
+    timestamp = fields.Datetime(string='Timestamp', default=fields.Datetime.now, index=True)
     total_found = fields.Integer(string='Delivery Orders Found')
     assignee_count = fields.Integer(string='Unique Assignees')
     status = fields.Selection([
         ('success', 'Success'),
         ('error', 'Error')
-    ], string='Status', required=True, default='success')
+    ], string='Status', required=True, index=True, default='success')
     message = fields.Text(string='Message')
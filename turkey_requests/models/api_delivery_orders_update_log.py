@@ -2,11 +2,13 @@ from odoo import models, fields
 
 class DeliveryOrdersUpdateLog(models.Model):
     _name = 'api.delivery.orders.update.log'
+    _inherit = ['api.log.metrics.mixin']
     _description = 'Update Delivery Orders API Log'
     _order = 'timestamp desc'
 
-    timestamp = fields.Datetime(string='Timestamp', default=fields.Datetime.now)
+    timestamp = fields.Datetime(string='Timestamp', default=fields.Datetime.now, index=True)
     updated_count = fields.Integer(string='Updated Count')
+    failed_count = fields.Integer(string='Failed Count', help='Orders that could not be updated, in bulk mode.')
     target_state = fields.Selection([
         ('draft', 'Draft'),
         ('waiting', 'Waiting'),
@@ -19,5 +21,5 @@ class DeliveryOrdersUpdateLog(models.Model):
     status = fields.Selection([
         ('success', 'Success'),
         ('error', 'Error')
-    ], string='Status', required=True)
+    ], string='Status', required=True, index=True)
     message = fields.Text(string='Message')
@@ -0,0 +1,92 @@
+from datetime import timedelta
+from typing import Dict, List, Optional
+from odoo import models, fields, api
+
+# Removals are reported to delta sync clients polling within this number of days
+TOMBSTONE_RETENTION_DAYS = 7
+# Key of the listed pickings being written, in cr.precommit.data
+LIST_EXITS_PRECOMMIT_KEY = 'turkey_requests.delivery_list_exits'
+
+
+class ApiDeliveryTombstone(models.Model):
+    _name = 'api.delivery.tombstone'
+    _description = 'Delivery Order Removed from the API List'
+    _order = 'removed_at desc'
+
+    picking_id = fields.Integer(string='Delivery Order ID', required=True, readonly=True)
+    reason = fields.Selection([
+        ('left', 'Left the List'),
+        ('deleted', 'Deleted'),
+    ], string='Reason', required=True, readonly=True)
+    scheduled_date = fields.Datetime(string='Scheduled Date', readonly=True,
+                                     help='Scheduled date of the delivery order while it was in the list.')
+    removed_at = fields.Datetime(string='Removed At', required=True, readonly=True, index=True)
+
+    @api.model
+    def _is_listed(self, picking) -> bool:
+        """Whether ``picking`` is in the delivery orders list of the API, whatever its day"""
+        return picking.picking_type_code == 'outgoing' and picking.state == 'delivery_assign'
+
+    @api.model
+    def _record_deletions(self, pickings) -> None:
+        """Keep a tombstone of the listed ``pickings`` about to be deleted"""
+        listed = pickings.filtered(self._is_listed)
+        if listed:
+            # Same clock as write_date: the start of the transaction
+            now = self.env.cr.now()
+            self.sudo().create([{
+                'picking_id': picking.id,
+                'reason': 'deleted',
+                'scheduled_date': picking.scheduled_date,
+                'removed_at': now,
+            } for picking in listed])
+
+    @api.model
+    def _track_list_exits(self, pickings) -> None:
+        """Remember the listed ``pickings`` about to be written, checked again when the transaction commits.
+
+        The state of a picking follows its moves and is recomputed without
+        going through ``write``, so the pickings are compared as they are
+        before their first write and at commit time.
+        """
+        listed = pickings.filtered(self._is_listed)
+        if not listed:
+            return
+        precommit = self.env.cr.precommit
+        tracked = precommit.data.get(LIST_EXITS_PRECOMMIT_KEY)
+        if tracked is None:
+            tracked = precommit.data[LIST_EXITS_PRECOMMIT_KEY] = {}
+            precommit.add(self.sudo()._record_list_exits)
+        for picking in listed:
+            tracked.setdefault(picking.id, picking.scheduled_date)
+
+    def _record_list_exits(self) -> None:
+        """Precommit hook: keep a tombstone of the tracked pickings which left the list or changed day"""
+        tracked: Dict[int, fields.Datetime] = self.env.cr.precommit.data.pop(LIST_EXITS_PRECOMMIT_KEY, {})
+        pickings = self.env['stock.picking'].sudo().with_context(active_test=False).browse(tracked).exists()
+        now = self.env.cr.now()
+        vals_list = [
+            {'picking_id': picking.id, 'reason': 'left', 'scheduled_date': tracked[picking.id], 'removed_at': now}
+            for picking in pickings
+            if not self._is_listed(picking) or picking.scheduled_date != tracked[picking.id]
+        ]
+        if vals_list:
+            self.create(vals_list)
+
+    @api.model
+    def _get_removed_ids(self, since, domain: Optional[List] = None) -> List[int]:
+        """Return the ids of the pickings removed after ``since``, among those matching ``domain`` beforehand"""
+        tombstones = self.sudo().search_read([('removed_at', '>', since)] + (domain or []), ['picking_id'])
+        return list(dict.fromkeys(row['picking_id'] for row in tombstones))
+
+    @api.model
+    def _get_last_removal(self, since) -> Optional[fields.Datetime]:
+        [(last_removal,)] = self.sudo()._read_group([('removed_at', '>', since)], [], ['removed_at:max'])
+        return last_removal
+
+    @api.autovacuum
+    def _gc_tombstones(self):
+        """Delete the tombstones older than the retention period"""
+        self.sudo().search([
+            ('removed_at', '<', fields.Datetime.now() - timedelta(days=TOMBSTONE_RETENTION_DAYS)),
+        ]).unlink()
@@ -0,0 +1,265 @@
+import json
+import logging
+from datetime import datetime, time
+from typing import Any, Dict, Iterable, Tuple
+from psycopg2.extras import execute_values
+from odoo import models, fields, api, SUPERUSER_ID, _
+from odoo.tools.sql import create_index
+from ..tools.encoding import json_dumps
+from ..tools.serializers import DeliveryOrderSerializer
+
+_logger = logging.getLogger(__name__)
+
+# Serve the full delivery orders list of the day from the dispatch snapshot
+SNAPSHOT_ENABLED_PARAM = 'turkey_requests.dispatch_snapshot_enabled'
+# Key of the picking ids to refresh at commit time, in cr.precommit.data
+SNAPSHOT_PRECOMMIT_KEY = 'turkey_requests.dispatch_snapshot_pickings'
+SNAPSHOT_BATCH_SIZE = 200
+
+
+class ApiDispatchSnapshot(models.Model):
+    _name = 'api.dispatch.snapshot'
+    _description = 'Delivery Orders Dispatch Snapshot'
+    _order = 'day desc, priority desc, scheduled_date, picking_id desc'
+
+    picking_id = fields.Many2one('stock.picking', string='Delivery Order', required=True, readonly=True,
+                                 ondelete='cascade')
+    day = fields.Date(string='Day', required=True, readonly=True)
+    assign_to = fields.Integer(string='Assignee', readonly=True, help='Id of the assignee record, 0 if unassigned.')
+    group_json = fields.Char(string='Assignee Key (JSON)', readonly=True,
+                             help='Serialized assign_to value of the group of the order in the API payload.')
+    priority = fields.Char(string='Priority', readonly=True)
+    scheduled_date = fields.Datetime(string='Scheduled Date', readonly=True)
+    payload = fields.Text(string='Payload (JSON)', readonly=True)
+
+    _sql_constraints = [
+        ('picking_unique', 'UNIQUE(picking_id)', 'A delivery order has a single snapshot row.'),
+    ]
+
+    def init(self):
+        # Matches the read query: one day, in the default order of pickings
+        create_index(self.env.cr, 'api_dispatch_snapshot_day_order_idx', self._table,
+                     ['day', 'priority DESC', 'scheduled_date', 'picking_id DESC'])
+
+    @api.model
+    def _is_enabled(self) -> bool:
+        param = self.env['ir.config_parameter'].sudo().get_param(SNAPSHOT_ENABLED_PARAM, 'False')
+        return param.lower() in ('1', 'true')
+
+    @api.model
+    def _get_api_env(self):
+        """Environment the delivery orders API serializes in: superuser, no language, archived records included.
+
+        Rows are built in it whoever wrote the picking, so that the payloads
+        (e.g. product names) do not depend on the language of that user.
+        """
+        return api.Environment(self.env.cr, SUPERUSER_ID, {'active_test': False})
+
+    @api.model
+    def _get_snapshot_domain(self):
+        """Domain of the pickings kept in the snapshot, whatever their day"""
+        return [('picking_type_code', '=', 'outgoing'), ('state', '=', 'delivery_assign')]
+
+    @api.model
+    def _mark_dirty(self, picking_ids: Iterable[int]) -> None:
+        """Schedule the refresh of the snapshot rows of ``picking_ids`` when the transaction commits"""
+        picking_ids = set(picking_ids)
+        if not picking_ids or not self._is_enabled():
+            return
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get(SNAPSHOT_PRECOMMIT_KEY)
+        if pending is None:
+            pending = precommit.data[SNAPSHOT_PRECOMMIT_KEY] = set()
+            precommit.add(self.sudo()._refresh_dirty)
+        pending.update(picking_ids)
+
+    @api.model
+    def _mark_dirty_where(self, domain) -> None:
+        """Schedule the refresh of the snapshot rows of the pickings matching ``domain``"""
+        if self._is_enabled():
+            self._mark_dirty(self._get_api_env()['stock.picking'].search(domain + self._get_snapshot_domain()).ids)
+
+    @api.model
+    def _mark_all_dirty(self) -> None:
+        """Schedule the refresh of every snapshot row, e.g. when the payload format settings change"""
+        if self._is_enabled():
+            self.flush_model()
+            self.env.cr.execute("SELECT picking_id FROM api_dispatch_snapshot")
+            self._mark_dirty(picking_id for [picking_id] in self.env.cr.fetchall())
+
+    def _refresh_dirty(self) -> None:
+        """Precommit hook: refresh the rows of the pickings written during the transaction"""
+        picking_ids = self.env.cr.precommit.data.pop(SNAPSHOT_PRECOMMIT_KEY, set())
+        self._refresh(picking_ids)
+
+    @api.model
+    def _refresh(self, picking_ids: Iterable[int]) -> None:
+        """Rebuild the snapshot rows of ``picking_ids``, removing those which left the snapshot domain"""
+        picking_ids = list(picking_ids)
+        if not picking_ids:
+            return
+        self.flush_model()
+        self.env.cr.execute("DELETE FROM api_dispatch_snapshot WHERE picking_id = ANY(%s)", [picking_ids])
+        pickings = self._get_api_env()['stock.picking'].search(
+            [('id', 'in', picking_ids)] + self._get_snapshot_domain())
+        self._insert_rows(pickings)
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild(self) -> int:
+        """Rebuild the whole snapshot from the pickings scheduled from today on"""
+        self.flush_model()
+        self.env.cr.execute("DELETE FROM api_dispatch_snapshot")
+        today_start = datetime.combine(fields.Date.today(), time.min)
+        pickings = self._get_api_env()['stock.picking'].search(
+            self._get_snapshot_domain() + [('scheduled_date', '>=', today_start)])
+        for start in range(0, len(pickings), SNAPSHOT_BATCH_SIZE):
+            self._insert_rows(pickings[start:start + SNAPSHOT_BATCH_SIZE])
+            self.env.invalidate_all()
+        self.invalidate_model()
+        _logger.info("Rebuilt the dispatch snapshot of %s delivery orders", len(pickings))
+        return len(pickings)
+
+    @api.model
+    def _compute_rows(self, pickings) -> Dict[int, Dict[str, Any]]:
+        """Serialize ``pickings`` the way /api/delivery_orders does, keyed by picking id"""
+        env = self._get_api_env()
+        pickings = pickings.with_env(env)
+        serializer = DeliveryOrderSerializer(env)
+        group_json = {}
+        for assign_to, picking_ids in serializer.group_ids_by_assignee(pickings):
+            for picking_id in picking_ids:
+                group_json[picking_id] = json_dumps(assign_to).decode()
+        payloads = serializer.serialize_pickings(pickings)
+        return {
+            row['id']: {
+                'day': row['scheduled_date'].date(),
+                'assign_to': row['assign_to'] or 0,
+                'group_json': group_json[row['id']],
+                'priority': row['priority'],
+                'scheduled_date': row['scheduled_date'],
+                'payload': json_dumps(payloads[row['id']]).decode(),
+            }
+            for row in pickings.read(['assign_to', 'priority', 'scheduled_date'], load=None)
+            if row['scheduled_date']
+        }
+
+    @api.model
+    def _insert_rows(self, pickings) -> None:
+        if not pickings:
+            return
+        rows = self._compute_rows(pickings)
+        now = fields.Datetime.now()
+        execute_values(self.env.cr._obj, """
+            INSERT INTO api_dispatch_snapshot (picking_id, day, assign_to, group_json, priority, scheduled_date,
+                                               payload, create_uid, create_date, write_uid, write_date)
+                 VALUES %s
+            ON CONFLICT (picking_id) DO UPDATE
+                    SET day = EXCLUDED.day, assign_to = EXCLUDED.assign_to, group_json = EXCLUDED.group_json,
+                        priority = EXCLUDED.priority, scheduled_date = EXCLUDED.scheduled_date,
+                        payload = EXCLUDED.payload, write_uid = EXCLUDED.write_uid, write_date = EXCLUDED.write_date
+        """, [
+            (picking_id, row['day'], row['assign_to'], row['group_json'], row['priority'], row['scheduled_date'],
+             row['payload'], self.env.uid, now, self.env.uid, now)
+            for picking_id, row in rows.items()
+        ])
+
+    @api.model
+    def _render_orders(self, day) -> Tuple[bytes, int, int]:
+        """Return the ``orders`` JSON array of ``day``, the number of orders and of assignees.
+
+        A single indexed query fetches the pre-serialized payloads in the
+        default order of pickings; they are grouped by assignee in order of
+        first appearance, unassigned orders last, as in the live computation.
+        """
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT assign_to, group_json, payload
+              FROM api_dispatch_snapshot
+             WHERE day = %s
+          ORDER BY priority DESC, scheduled_date, picking_id DESC
+        """, [day])
+        rows = self.env.cr.fetchall()
+        groups = {}
+        unassigned = []
+        for assign_to, group_json, payload in rows:
+            if assign_to:
+                groups.setdefault(assign_to, (group_json, []))[1].append(payload)
+            else:
+                unassigned.append(payload)
+        parts = [
+            f'{{"assign_to":{group_json},"orders":[{",".join(payloads)}]}}'
+            for group_json, payloads in groups.values()
+        ]
+        if unassigned:
+            parts.append(f'{{"assign_to":null,"orders":[{",".join(unassigned)}]}}')
+        return f'[{",".join(parts)}]'.encode(), len(rows), len(groups)
+
+    @api.model
+    def _check_consistency(self, day=None) -> Dict[str, list]:
+        """Compare the snapshot rows of ``day`` with the live computation of its delivery orders"""
+        day = day or fields.Date.today()
+        self.flush_model()
+        pickings = self._get_api_env()['stock.picking'].search(
+            self._get_snapshot_domain() + [
+                ('scheduled_date', '>=', datetime.combine(day, time.min)),
+                ('scheduled_date', '<=', datetime.combine(day, time.max)),
+            ])
+        live = self._compute_rows(pickings)
+        snapshot = {
+            row['picking_id']: row
+            for row in self.search_read([('day', '=', day)], ['picking_id', 'group_json', 'payload'], load=None)
+        }
+        fields_to_compare = ('group_json', 'payload')
+        return {
+            'missing': sorted(set(live) - set(snapshot)),
+            'extra': sorted(set(snapshot) - set(live)),
+            'stale': sorted(
+                picking_id for picking_id in set(live) & set(snapshot)
+                if any(json.loads(live[picking_id][name]) != json.loads(snapshot[picking_id][name])
+                       for name in fields_to_compare)
+            ),
+        }
+
+    @api.model
+    def action_check_consistency(self):
+        """Server action: report the differences between today's snapshot and the live data"""
+        report = self._check_consistency()
+        differences = {name: ids for name, ids in report.items() if ids}
+        if differences:
+            _logger.warning("Dispatch snapshot differs from the live delivery orders: %s", differences)
+            message = _("Missing: %(missing)s, extra: %(extra)s, stale: %(stale)s delivery orders. "
+                        "Rebuild the snapshot to fix it.",
+                        missing=len(report['missing']), extra=len(report['extra']), stale=len(report['stale']))
+        else:
+            message = _("The dispatch snapshot matches the live delivery orders.")
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _("Dispatch Snapshot Consistency"),
+                'message': message,
+                'type': 'warning' if differences else 'success',
+                'sticky': bool(differences),
+            },
+        }
+
+    @api.model
+    def action_rebuild(self):
+        """Server action: rebuild the snapshot from the live data"""
+        count = self._rebuild()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _("Dispatch Snapshot"),
+                'message': _("Snapshot rebuilt with %s delivery orders.", count),
+                'type': 'success',
+            },
+        }
+
+    @api.model
+    def _cron_rebuild(self):
+        """Rebuild the snapshot daily, dropping past days and catching changes made outside of the hooks"""
+        if self._is_enabled():
+            self._rebuild()
@@ -1,10 +1,30 @@
-import time
-import requests
+import json
 import logging
-from odoo import models, fields, api
+import random
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, List
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+from ..tools.endpoint_checks import (
+    CHECK_DEADLINE_PARAM, CHECK_PER_HOST_PARAM, CHECK_WORKERS_PARAM, DEFAULT_CHECK_DEADLINE, DEFAULT_CHECK_PER_HOST,
+    DEFAULT_CHECK_WORKERS, run_checks,
+)
+from ..tools.http_sessions import (
+    BACKOFF_PARAM, DEFAULT_BACKOFF, DEFAULT_POOL_SIZE, DEFAULT_RETRIES, POOL_SIZE_PARAM, RETRIES_PARAM,
+)
+from ..tools.indexes import log_index_report
 
 _logger = logging.getLogger(__name__)
 
+# Scheduled checks of api.endpoints
+CHECK_BATCH_SIZE_PARAM = 'turkey_requests.endpoint_check_batch_size'
+CHECK_JITTER_PARAM = 'turkey_requests.endpoint_check_jitter'
+DEFAULT_CHECK_BATCH_SIZE = 20
+# Share of the check interval randomly added to the next check date
+DEFAULT_CHECK_JITTER = 0.1
+MAX_CHECK_BATCHES = 10
+
 class ApiEndpoint(models.Model):
     _name = 'api.endpoints'
     _description = 'API Endpoints'
@@ -30,9 +50,28 @@ class ApiEndpoint(models.Model):
     last_call = fields.Datetime(string='Last Call')
     total_calls = fields.Integer(string='Total Calls', default=0)
     success_calls = fields.Integer(string='Successful Calls', default=0)
-    success_rate = fields.Float(string='Success Rate', compute='_compute_success_rate', store=True)
+    success_rate = fields.Float(string='Success Rate', compute='_compute_success_rate')
     recent_calls = fields.One2many('api.endpoint.calls', 'endpoint_id', string='Recent Calls')
     documentation = fields.Html(string='Documentation')
+    request_headers = fields.Text(string='Request Headers', help='JSON object of the headers sent with the request.')
+    request_body = fields.Text(string='Request Body')
+    api_key_header = fields.Char(string='API Key Header', default='Authorization')
+    api_key = fields.Char(string='API Key', groups='base.group_system')
+    auth_login = fields.Char(string='Username')
+    auth_password = fields.Char(string='Password', groups='base.group_system')
+    check_interval = fields.Integer(string='Check Interval (min)', default=0,
+                                    help='Minutes between two scheduled checks, 0 to only check on demand.')
+    next_check = fields.Datetime(string='Next Check', index=True, copy=False)
+
+    @api.constrains('request_headers')
+    def _check_request_headers(self):
+        for record in self.filtered('request_headers'):
+            try:
+                headers = json.loads(record.request_headers)
+            except ValueError:
+                headers = None
+            if not isinstance(headers, dict):
+                raise ValidationError(_("The request headers of %s must be a JSON object.", record.name))
 
     @api.depends('total_calls', 'success_calls')
     def _compute_success_rate(self):
@@ -42,58 +81,163 @@ class ApiEndpoint(models.Model):
             else:
                 record.success_rate = 0.0
 
+    def _prepare_check_spec(self) -> Dict[str, Any]:
+        """Return the plain values needed to call the endpoint outside of the ORM, credentials applied"""
+        self.ensure_one()
+        record = self.sudo()
+        headers = json.loads(record.request_headers) if record.request_headers else {}
+        auth = None
+        if record.auth_type == 'api_key' and record.api_key:
+            headers[record.api_key_header or 'Authorization'] = record.api_key
+        elif record.auth_type == 'user' and record.auth_login:
+            auth = (record.auth_login, record.auth_password or '')
+        return {
+            'id': record.id,
+            'name': record.name,
+            'method': record.method,
+            'url': record.url,
+            'headers': headers,
+            'data': record.request_body.encode() if record.request_body else None,
+            'auth': auth,
+        }
+
     def call_endpoint(self):
-        """Perform the actual API call and log the result in recent_calls."""
-        for rec in self:
-            if rec.status != 'active':
-                _logger.warning("Endpoint %s is inactive, skipping request.", rec.name)
-                continue
+        """Call the active endpoints of the recordset concurrently and log the results in recent_calls.
 
-            start_time = time.time()
-            call_status = 'error'
-            error_message = ''
-            response_time_ms = 0.0
+        The HTTP calls run in a bounded thread pool (see
+        :func:`~odoo.addons.turkey_requests.tools.endpoint_checks.run_checks`),
+        then all call logs and counters are written at once.
+        """
+        endpoints = self.filtered(lambda rec: rec.status == 'active')
+        for rec in self - endpoints:
+            _logger.warning("Endpoint %s is inactive, skipping request.", rec.name)
+        if not endpoints:
+            return
 
-            # Increment total_calls
-            rec.total_calls += 1
+        get_param = self.env['ir.config_parameter'].sudo().get_param
+        results = run_checks(
+            [rec._prepare_check_spec() for rec in endpoints],
+            max_workers=int(get_param(CHECK_WORKERS_PARAM, DEFAULT_CHECK_WORKERS)),
+            max_per_host=int(get_param(CHECK_PER_HOST_PARAM, DEFAULT_CHECK_PER_HOST)),
+            deadline_seconds=float(get_param(CHECK_DEADLINE_PARAM, DEFAULT_CHECK_DEADLINE)),
+            session_options={
+                'pool_size': int(get_param(POOL_SIZE_PARAM, DEFAULT_POOL_SIZE)),
+                'retries': int(get_param(RETRIES_PARAM, DEFAULT_RETRIES)),
+                'backoff': float(get_param(BACKOFF_PARAM, DEFAULT_BACKOFF)),
+            },
+        )
+        self._record_call_results(results)
 
-            try:
-                if rec.method == 'GET':
-                    response = requests.get(rec.url, timeout=10)
-                elif rec.method == 'POST':
-                    response = requests.post(rec.url, timeout=10)
-                elif rec.method == 'PUT':
-                    response = requests.put(rec.url, timeout=10)
-                else:  # DELETE
-                    response = requests.delete(rec.url, timeout=10)
-
-                response_time_ms = (time.time() - start_time) * 1000
-
-                if response.status_code == 200:
-                    call_status = 'success'
-                    rec.success_calls += 1
-                    _logger.info("Endpoint %s responded 200 OK.", rec.name)
-                else:
-                    call_status = 'error'
-                    error_message = f"HTTP {response.status_code}: {response.text}"
-                    _logger.warning("Endpoint %s returned status %s.", rec.name, response.status_code)
-
-            except Exception as ex:
-                error_message = str(ex)
-                response_time_ms = (time.time() - start_time) * 1000
-                _logger.error("Error calling endpoint %s: %s", rec.name, error_message)
-
-            # Update last_call timestamp
-            rec.last_call = fields.Datetime.now()
-
-            # Create a log record
-            self.env['api.endpoint.calls'].create({
-                'endpoint_id': rec.id,
-                'timestamp': fields.Datetime.now(),
-                'status': call_status,
-                'response_time': response_time_ms,
-                'error_message': error_message
-            })
+    def _record_call_results(self, results: List[Dict[str, Any]]) -> None:
+        """Create the call logs of ``results`` and update the endpoint counters in one batch.
+
+        Counters are incremented in SQL rather than through a read-modify-write
+        of the ORM, so concurrent checks of the same endpoint never lose an
+        update and the row is only locked for the duration of the statement.
+        """
+        now = fields.Datetime.now()
+        self.env['api.endpoint.calls'].create([{**result, 'timestamp': now} for result in results])
+        totals = defaultdict(lambda: [0, 0])
+        for result in results:
+            totals[result['endpoint_id']][0] += 1
+            totals[result['endpoint_id']][1] += result['status'] == 'success'
+        endpoint_ids = sorted(totals)
+        self.flush_model(['last_call', 'total_calls', 'success_calls'])
+        self.env.cr.execute("""
+            UPDATE api_endpoints e
+               SET total_calls = COALESCE(e.total_calls, 0) + v.total,
+                   success_calls = COALESCE(e.success_calls, 0) + v.success,
+                   last_call = %s
+              FROM unnest(%s::int[], %s::int[], %s::int[]) AS v(id, total, success)
+             WHERE e.id = v.id
+        """, [now, endpoint_ids, [totals[i][0] for i in endpoint_ids], [totals[i][1] for i in endpoint_ids]])
+        self.invalidate_model(['last_call', 'total_calls', 'success_calls'])
+
+    def _compute_next_check(self, now, first: bool = False):
+        """Return the next check date of the endpoint, with a random jitter.
+
+        The first check of an endpoint is spread over a whole interval, the
+        following ones are delayed by up to ``jitter`` times the interval, so
+        that endpoints sharing an interval drift apart instead of being
+        checked in the same cron run forever.
+        """
+        self.ensure_one()
+        interval = self.check_interval * 60
+        if first:
+            return now + timedelta(seconds=random.uniform(0, interval))
+        jitter = float(self.env['ir.config_parameter'].sudo().get_param(CHECK_JITTER_PARAM, DEFAULT_CHECK_JITTER))
+        return now + timedelta(seconds=interval + random.uniform(0, interval * jitter))
+
+    def _lock_due_endpoints(self, now, limit: int):
+        """Lock and return the endpoints due for a scheduled check.
+
+        Rows locked by another worker are skipped, so several cron workers
+        share the due endpoints without checking the same one twice.
+        """
+        self.flush_model(['status', 'check_interval', 'next_check'])
+        self.env.cr.execute("""
+            SELECT id
+              FROM api_endpoints
+             WHERE status = 'active'
+               AND check_interval > 0
+               AND (next_check IS NULL OR next_check <= %s)
+          ORDER BY next_check NULLS FIRST, id
+             LIMIT %s
+               FOR UPDATE SKIP LOCKED
+        """, [now, limit])
+        return self.browse(row[0] for row in self.env.cr.fetchall())
+
+    @api.model
+    def _cron_run_due_checks(self):
+        """Check the endpoints whose next check date is reached, in batches.
+
+        The due endpoints are claimed by moving their next check date forward,
+        and that claim is committed before the HTTP calls, so the row locks are
+        not held while the checks run.
+        """
+        limit = int(self.env['ir.config_parameter'].sudo().get_param(CHECK_BATCH_SIZE_PARAM, DEFAULT_CHECK_BATCH_SIZE))
+        for _batch in range(MAX_CHECK_BATCHES):
+            now = fields.Datetime.now()
+            endpoints = self._lock_due_endpoints(now, limit)
+            if not endpoints:
+                break
+            unscheduled = endpoints.filtered(lambda rec: not rec.next_check)
+            for rec in unscheduled:
+                rec.next_check = rec._compute_next_check(now, first=True)
+            due = endpoints - unscheduled
+            for rec in due:
+                rec.next_check = rec._compute_next_check(now)
+            if not self.env.registry.in_test_mode():
+                # Commit the claim and release the row locks of the batch
+                self.env.cr.commit()
+            due.call_endpoint()
+            if not self.env.registry.in_test_mode():
+                self.env.cr.commit()
+
+    @api.model
+    def action_check_indexes(self):
+        """Server action: report the API indexes missing from the database or never used by a scan"""
+        report = log_index_report(self.env.cr)
+        messages = []
+        if report['missing']:
+            messages.append(_("Missing indexes: %s.", ', '.join(report['missing'])))
+        if report['unused']:
+            messages.append(_("Indexes never used since the last statistics reset: %s.", ', '.join(report['unused'])))
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _("Delivery Orders API Indexes"),
+                'message': ' '.join(messages) or _("All the API indexes are present and in use."),
+                'type': 'warning' if messages else 'success',
+                'sticky': bool(report['missing']),
+            },
+        }
+
+    @api.model
+    def _cron_report_indexes(self):
+        """Log the index report once the scan counters had time to build up, unlike at installation"""
+        log_index_report(self.env.cr)
 
     def button_send_request(self):
         """Method to call from a form button: triggers call_endpoint() and optionally do more."""
@@ -107,11 +251,15 @@ class ApiEndpointCall(models.Model):
     _description = 'API Endpoint Calls'
     _order = 'timestamp desc'
 
-    endpoint_id = fields.Many2one('api.endpoints', string='Endpoint', required=True)
-    timestamp = fields.Datetime(string='Timestamp', default=fields.Datetime.now)
+    endpoint_id = fields.Many2one('api.endpoints', string='Endpoint', required=True, index=True)
+    timestamp = fields.Datetime(string='Timestamp', default=fields.Datetime.now, index=True)
     status = fields.Selection([
         ('success', 'Success'),
         ('error', 'Error')
-    ], string='Status', required=True)
+    ], string='Status', required=True, index=True)
     response_time = fields.Float(string='Response Time (ms)')
+    time_to_first_byte = fields.Float(string='Time to First Byte (ms)',
+                                      help='Time until the response headers were received, including the '
+                                           'connection setup when no pooled connection could be reused.')
+    transfer_time = fields.Float(string='Transfer Time (ms)', help='Time spent downloading the response body.')
     error_message = fields.Text(string='Error Message')
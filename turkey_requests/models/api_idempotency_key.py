@@ -0,0 +1,67 @@
+import logging
+from datetime import timedelta
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Hours during which a stored response is replayed for the same key
+IDEMPOTENCY_TTL_PARAM = 'turkey_requests.idempotency_ttl_hours'
+DEFAULT_IDEMPOTENCY_TTL = 24
+
+
+class ApiIdempotencyKey(models.Model):
+    _name = 'api.idempotency.key'
+    _description = 'API Idempotency Key'
+    _order = 'id desc'
+
+    key = fields.Char(string='Key', required=True, readonly=True)
+    endpoint = fields.Char(string='Endpoint', required=True, readonly=True)
+    user_id = fields.Many2one('res.users', string='API User', required=True, readonly=True, ondelete='cascade')
+    request_hash = fields.Char(string='Request Hash', readonly=True)
+    status_code = fields.Integer(string='Status Code', readonly=True)
+    response_body = fields.Text(string='Response Body', readonly=True)
+    expires_at = fields.Datetime(string='Expires At', required=True, readonly=True, index=True)
+
+    _sql_constraints = [
+        ('key_unique', 'UNIQUE(endpoint, user_id, key)', 'An idempotency key is unique per endpoint and API user.'),
+    ]
+
+    @api.model
+    def _get_ttl(self) -> timedelta:
+        return timedelta(hours=int(self.env['ir.config_parameter'].sudo().get_param(
+            IDEMPOTENCY_TTL_PARAM, DEFAULT_IDEMPOTENCY_TTL)))
+
+    @api.model
+    def _acquire(self, endpoint: str, user_id: int, key: str) -> 'ApiIdempotencyKey':
+        """Return the row of ``key``, created if needed and locked until the end of the transaction.
+
+        A concurrent request with the same key blocks on the insert or on the
+        row lock until the first one commits, then finds its stored response.
+        Expired rows are reset as if the key was new.
+        """
+        now = fields.Datetime.now()
+        self.env.cr.execute("""
+            INSERT INTO api_idempotency_key (key, endpoint, user_id, expires_at, create_uid, create_date,
+                                             write_uid, write_date)
+                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (endpoint, user_id, key) DO NOTHING
+        """, [key, endpoint, user_id, now + self._get_ttl(), self.env.uid, now, self.env.uid, now])
+        self.env.cr.execute("""
+            SELECT id
+              FROM api_idempotency_key
+             WHERE endpoint = %s AND user_id = %s AND key = %s
+               FOR UPDATE
+        """, [endpoint, user_id, key])
+        record = self.browse(self.env.cr.fetchone()[0])
+        record.invalidate_recordset()
+        if record.expires_at <= now:
+            record.write({'request_hash': False, 'status_code': 0, 'response_body': False,
+                          'expires_at': now + self._get_ttl()})
+        return record
+
+    @api.autovacuum
+    def _gc_expired_keys(self):
+        """Delete the expired idempotency keys"""
+        expired = self.search([('expires_at', '<=', fields.Datetime.now())])
+        _logger.info("Deleting %s expired API idempotency keys", len(expired))
+        expired.unlink()
@@ -0,0 +1,15 @@
+from odoo import models, fields
+
+
+class ApiLogMetricsMixin(models.AbstractModel):
+    _name = 'api.log.metrics.mixin'
+    _description = 'API Request Metrics'
+
+    duration_ms = fields.Float(string='Duration (ms)', readonly=True)
+    db_time_ms = fields.Float(string='DB Time (ms)', readonly=True)
+    query_count = fields.Integer(string='SQL Queries', readonly=True)
+    response_size = fields.Integer(string='Response Size (bytes)', readonly=True,
+                                   help='Empty for streamed responses, whose size is not known in advance.')
+    profile = fields.Text(string='Profile', readonly=True,
+                          help='Stack sampling profile, captured for slow or sampled requests when the '
+                               'profiler is enabled.')
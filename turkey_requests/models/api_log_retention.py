@@ -0,0 +1,96 @@
+import logging
+from datetime import datetime, timedelta
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+LOG_MODELS = [
+    ('api.delivery.orders.log', 'Delivery Orders Logs'),
+    ('api.delivery.orders.update.log', 'Update Logs'),
+    ('api.sale.order.data.log', 'Sale Order Data Logs'),
+    ('api.endpoint.calls', 'Endpoint Calls'),
+    ('api.request.profile', 'Request Profiles'),
+]
+
+
+class ApiLogRetention(models.Model):
+    _name = 'api.log.retention'
+    _description = 'API Log Retention Policy'
+    _order = 'log_model'
+
+    log_model = fields.Selection(LOG_MODELS, string='Log', required=True)
+    retention_days = fields.Integer(string='Retention (Days)', required=True, default=30)
+    batch_size = fields.Integer(string='Batch Size', required=True, default=5000)
+    max_batches = fields.Integer(string='Max Batches per Run', required=True, default=50,
+                                 help='Bounds the time spent by a single run of the retention cron.')
+    active = fields.Boolean(string='Active', default=True)
+    last_run = fields.Datetime(string='Last Run', readonly=True)
+    last_archived_count = fields.Integer(string='Rows Archived on Last Run', readonly=True)
+
+    _sql_constraints = [
+        ('log_model_uniq', 'unique(log_model)', 'Only one retention policy per log is allowed.'),
+        ('retention_days_positive', 'CHECK(retention_days > 0)', 'The retention period must be positive.'),
+        ('batch_size_positive', 'CHECK(batch_size > 0)', 'The batch size must be positive.'),
+    ]
+
+    @api.model
+    def _cron_archive_logs(self):
+        """Archive and purge the log rows older than their retention period, and the old traffic rollups"""
+        for policy in self.search([]):
+            policy._archive_logs()
+        self.env['api.metrics.rollup']._purge_rollups()
+
+    def _archive_logs(self):
+        """Roll up old rows into daily summaries, then delete them, in bounded batches"""
+        self.ensure_one()
+        Log = self.env[self.log_model].sudo()
+        cutoff = fields.Datetime.now() - timedelta(days=self.retention_days)
+        archived = 0
+        for _batch in range(self.max_batches):
+            logs = Log.search([('timestamp', '<', cutoff)], order='timestamp', limit=self.batch_size)
+            if not logs:
+                break
+            self.env['api.log.daily.summary']._add_logs(self.log_model, logs)
+            logs.unlink()
+            archived += len(logs)
+            if not self.env.registry.in_test_mode():
+                # Keep every batch short-lived and its locks released
+                self.env.cr.commit()
+        self.write({'last_run': fields.Datetime.now(), 'last_archived_count': archived})
+        _logger.info("Archived %s rows of %s older than %s", archived, self.log_model, cutoff)
+
+
+class ApiLogDailySummary(models.Model):
+    _name = 'api.log.daily.summary'
+    _description = 'API Log Daily Summary'
+    _order = 'day desc, log_model'
+
+    log_model = fields.Selection(LOG_MODELS, string='Log', required=True, readonly=True)
+    day = fields.Date(string='Day', required=True, readonly=True)
+    status = fields.Selection([
+        ('success', 'Success'),
+        ('error', 'Error')
+    ], string='Status', readonly=True)
+    record_count = fields.Integer(string='Rows', readonly=True)
+
+    _sql_constraints = [
+        ('log_model_day_status_uniq', 'unique(log_model, day, status)', 'Only one summary per log, day and status.'),
+    ]
+
+    @api.model
+    def _add_logs(self, log_model: str, logs):
+        """Add the per day and status counts of ``logs`` to the summaries"""
+        groups = logs._read_group([('id', 'in', logs.ids)], ['timestamp:day', 'status'], ['__count'])
+        for day, status, count in groups:
+            if isinstance(day, datetime):
+                day = day.date()
+            self.env.cr.execute("""
+                INSERT INTO api_log_daily_summary
+                    (log_model, day, status, record_count, create_uid, create_date, write_uid, write_date)
+                VALUES (%s, %s, %s, %s, %s, now() at time zone 'UTC', %s, now() at time zone 'UTC')
+                ON CONFLICT (log_model, day, status)
+                DO UPDATE SET record_count = api_log_daily_summary.record_count + EXCLUDED.record_count,
+                              write_date = EXCLUDED.write_date
+            """, [log_model, day, status or None, count, self.env.uid, self.env.uid])
+        self.invalidate_model(['record_count'])
@@ -0,0 +1,160 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, List, Tuple
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets, plus one overflow bucket
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+GRANULARITIES = {
+    'minute': lambda ts: ts.replace(second=0, microsecond=0),
+    'hour': lambda ts: ts.replace(minute=0, second=0, microsecond=0),
+}
+# Rollups are deleted after this number of days, per granularity
+ROLLUP_RETENTION_DAYS = {'minute': 7, 'hour': 365}
+
+
+def _bucket_index(duration_ms: float) -> int:
+    for index, bound in enumerate(LATENCY_BUCKETS_MS):
+        if duration_ms <= bound:
+            return index
+    return len(LATENCY_BUCKETS_MS)
+
+
+def _percentile(histogram: List[int], quantile: float, max_ms: float) -> float:
+    """Estimate a percentile as the upper bound of the bucket that contains it"""
+    total = sum(histogram)
+    if not total:
+        return 0.0
+    threshold = quantile * total
+    cumulative = 0
+    for index, count in enumerate(histogram):
+        cumulative += count
+        if cumulative >= threshold:
+            return float(min(LATENCY_BUCKETS_MS[index], max_ms)) if index < len(LATENCY_BUCKETS_MS) else max_ms
+    return max_ms
+
+
+class ApiMetricsRollup(models.Model):
+    _name = 'api.metrics.rollup'
+    _description = 'API Traffic Metrics Rollup'
+    _order = 'bucket_start desc, endpoint'
+
+    endpoint = fields.Char(string='Endpoint', required=True, readonly=True, index=True)
+    granularity = fields.Selection([
+        ('minute', 'Minute'),
+        ('hour', 'Hour')
+    ], string='Granularity', required=True, readonly=True)
+    bucket_start = fields.Datetime(string='Period Start', required=True, readonly=True, index=True)
+    call_count = fields.Integer(string='Calls', readonly=True)
+    error_count = fields.Integer(string='Errors', readonly=True)
+    latency_sum = fields.Float(string='Total Latency (ms)', readonly=True)
+    latency_max = fields.Float(string='Max Latency (ms)', readonly=True, aggregator='max')
+    latency_histogram = fields.Json(string='Latency Histogram', readonly=True)
+    # Grouped averages are weighted by the number of calls, see _read_group_select
+    latency_avg = fields.Float(string='Avg Latency (ms)', compute='_compute_latency_avg', store=True, aggregator='avg')
+    # Percentiles of several periods cannot be derived from the per-period ones
+    latency_p50 = fields.Float(string='p50 Latency (ms)', readonly=True, aggregator=False)
+    latency_p95 = fields.Float(string='p95 Latency (ms)', readonly=True, aggregator=False)
+    latency_p99 = fields.Float(string='p99 Latency (ms)', readonly=True, aggregator=False)
+    error_rate = fields.Float(string='Error Rate', compute='_compute_error_rate', store=True, aggregator='avg')
+
+    _sql_constraints = [
+        ('endpoint_bucket_uniq', 'unique(endpoint, granularity, bucket_start)',
+         'Only one rollup per endpoint and period is allowed.'),
+    ]
+
+    @api.depends('latency_sum', 'call_count')
+    def _compute_latency_avg(self):
+        for record in self:
+            record.latency_avg = record.latency_sum / record.call_count if record.call_count else 0.0
+
+    @api.depends('error_count', 'call_count')
+    def _compute_error_rate(self):
+        for record in self:
+            record.error_rate = (record.error_count / record.call_count) * 100 if record.call_count else 0.0
+
+    def _read_group_select(self, aggregate_spec: str, query) -> SQL:
+        """Aggregate the average latency and the error rate of grouped rows from their totals.
+
+        A plain average of the per-period values would give a quiet period
+        the same weight as a busy one.
+        """
+        if aggregate_spec in ('latency_avg:avg', 'error_rate:avg'):
+            call_count = self._field_to_sql(self._table, 'call_count', query)
+            if aggregate_spec == 'latency_avg:avg':
+                total = self._field_to_sql(self._table, 'latency_sum', query)
+            else:
+                total = SQL("%s * 100.0", self._field_to_sql(self._table, 'error_count', query))
+            return SQL("COALESCE(SUM(%s) / NULLIF(SUM(%s), 0), 0)", total, call_count)
+        return super()._read_group_select(aggregate_spec, query)
+
+    @api.model
+    def _add_samples(self, samples: Iterable[Tuple[str, datetime, str, float]]) -> None:
+        """Fold ``(endpoint, timestamp, status, duration_ms)`` samples into the minute and hour rollups"""
+        buckets = defaultdict(lambda: {
+            'calls': 0, 'errors': 0, 'sum': 0.0, 'max': 0.0, 'histogram': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+        })
+        for endpoint, timestamp, status, duration_ms in samples:
+            for granularity, truncate in GRANULARITIES.items():
+                bucket = buckets[(endpoint, granularity, truncate(timestamp))]
+                bucket['calls'] += 1
+                bucket['errors'] += status != 'success'
+                bucket['sum'] += duration_ms
+                bucket['max'] = max(bucket['max'], duration_ms)
+                bucket['histogram'][_bucket_index(duration_ms)] += 1
+
+        # Lock the rollups in a fixed order so that concurrent flushes cannot deadlock
+        for endpoint, granularity, bucket_start in sorted(buckets):
+            bucket = buckets[(endpoint, granularity, bucket_start)]
+            rollup = self._get_locked_rollup(endpoint, granularity, bucket_start)
+            histogram = [
+                current + added
+                for current, added in zip(rollup.latency_histogram or [0] * len(bucket['histogram']), bucket['histogram'])
+            ]
+            latency_max = max(rollup.latency_max, bucket['max'])
+            rollup.write({
+                'call_count': rollup.call_count + bucket['calls'],
+                'error_count': rollup.error_count + bucket['errors'],
+                'latency_sum': rollup.latency_sum + bucket['sum'],
+                'latency_max': latency_max,
+                'latency_histogram': histogram,
+                'latency_p50': _percentile(histogram, 0.50, latency_max),
+                'latency_p95': _percentile(histogram, 0.95, latency_max),
+                'latency_p99': _percentile(histogram, 0.99, latency_max),
+            })
+
+    def _get_locked_rollup(self, endpoint: str, granularity: str, bucket_start: datetime):
+        """Return the rollup of a period, creating it if needed, locked against concurrent writers"""
+        self.flush_model()
+        self.env.cr.execute("""
+            INSERT INTO api_metrics_rollup
+                (endpoint, granularity, bucket_start, call_count, error_count, latency_sum, latency_max,
+                 create_uid, create_date, write_uid, write_date)
+            VALUES (%s, %s, %s, 0, 0, 0, 0, %s, now() at time zone 'UTC', %s, now() at time zone 'UTC')
+            ON CONFLICT (endpoint, granularity, bucket_start) DO NOTHING
+        """, [endpoint, granularity, bucket_start, self.env.uid, self.env.uid])
+        self.env.cr.execute("""
+            SELECT id FROM api_metrics_rollup
+             WHERE endpoint = %s AND granularity = %s AND bucket_start = %s
+               FOR UPDATE
+        """, [endpoint, granularity, bucket_start])
+        rollup = self.browse(self.env.cr.fetchone()[0])
+        rollup.invalidate_recordset()
+        return rollup
+
+    @api.model
+    def _purge_rollups(self):
+        """Delete the rollups older than the retention period of their granularity"""
+        now = fields.Datetime.now()
+        for granularity, retention_days in ROLLUP_RETENTION_DAYS.items():
+            rollups = self.sudo().search([
+                ('granularity', '=', granularity),
+                ('bucket_start', '<', now - timedelta(days=retention_days)),
+            ])
+            _logger.info("Deleting %s API %s rollups older than %s days", len(rollups), granularity, retention_days)
+            rollups.unlink()
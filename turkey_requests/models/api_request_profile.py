@@ -0,0 +1,16 @@
+from odoo import models, fields
+
+
+class ApiRequestProfile(models.Model):
+    _name = 'api.request.profile'
+    _inherit = ['api.log.metrics.mixin']
+    _description = 'API Request Profile'
+    _order = 'timestamp desc'
+
+    timestamp = fields.Datetime(string='Timestamp', default=fields.Datetime.now, index=True)
+    endpoint = fields.Char(string='Endpoint', index=True)
+    status_code = fields.Integer(string='HTTP Status')
+    status = fields.Selection([
+        ('success', 'Success'),
+        ('error', 'Error')
+    ], string='Status', required=True, index=True, default='success')
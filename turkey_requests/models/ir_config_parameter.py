@@ -0,0 +1,27 @@
+from odoo import models, api
+
+from ..tools.serializers import PRODUCT_NAME_LANGS_PARAM
+
+
+class IrConfigParameter(models.Model):
+    _inherit = 'ir.config_parameter'
+
+    def _mark_dispatch_snapshot_dirty(self) -> None:
+        """Refresh the whole dispatch snapshot when the product name languages of its payloads change"""
+        if PRODUCT_NAME_LANGS_PARAM in self.mapped('key'):
+            self.env['api.dispatch.snapshot']._mark_all_dirty()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        params = super().create(vals_list)
+        params._mark_dispatch_snapshot_dirty()
+        return params
+
+    def write(self, vals):
+        res = super().write(vals)
+        self._mark_dispatch_snapshot_dirty()
+        return res
+
+    def unlink(self):
+        self._mark_dispatch_snapshot_dirty()
+        return super().unlink()
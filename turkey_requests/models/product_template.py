@@ -0,0 +1,25 @@
+from odoo import models
+
+
+class ProductTemplate(models.Model):
+    _inherit = 'product.template'
+
+    def _mark_dispatch_snapshot_dirty(self) -> None:
+        """Refresh the dispatch snapshot rows whose move or order lines show the names of the products"""
+        self.env['api.dispatch.snapshot']._mark_dirty_where([
+            '|', ('move_ids.product_id.product_tmpl_id', 'in', self.ids),
+            ('sale_id.order_line.product_id.product_tmpl_id', 'in', self.ids),
+        ])
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'name' in vals:
+            self._mark_dispatch_snapshot_dirty()
+        return res
+
+    def update_field_translations(self, field_name, translations, *args, **kwargs):
+        # Translations edited from the UI do not go through write()
+        res = super().update_field_translations(field_name, translations, *args, **kwargs)
+        if field_name == 'name':
+            self._mark_dispatch_snapshot_dirty()
+        return res
@@ -0,0 +1,16 @@
+from odoo import models
+
+from ..tools.serializers import PARTNER_FIELDS
+
+
+class ResPartner(models.Model):
+    _inherit = 'res.partner'
+
+    def write(self, vals):
+        res = super().write(vals)
+        if not vals.keys().isdisjoint(PARTNER_FIELDS):
+            # The payloads embed the delivery and sale order partners
+            self.env['api.dispatch.snapshot']._mark_dirty_where([
+                '|', ('partner_id', 'in', self.ids), ('sale_id.partner_id', 'in', self.ids),
+            ])
+        return res
@@ -0,0 +1,49 @@
+import hashlib
+import time
+
+from odoo import api, models, tools
+from odoo.exceptions import AccessDenied
+
+# Longest time (seconds) a validation stays cached, so that keys reaching their
+# expiration date stop authenticating; revoked and deleted keys are dropped at once
+API_KEY_CACHE_TTL = 60
+
+
+class ResUsersApikeys(models.Model):
+    _inherit = 'res.users.apikeys'
+
+    @api.model
+    def _check_api_key(self, key: str):
+        """Return the id of the user of the ``rpc`` API key ``key``, or False.
+
+        Successful validations are cached in the registry LRU cache, keyed by
+        the digest of the key and the current TTL slot. Deleting or revoking
+        a key clears that cache in every worker through the registry
+        signaling, and entries of past slots are never hit again.
+        """
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        try:
+            return self._check_api_key_digest(digest, int(time.time() // API_KEY_CACHE_TTL), key)
+        except AccessDenied:
+            return False
+
+    @tools.ormcache('digest', 'time_slot')
+    def _check_api_key_digest(self, digest: str, time_slot: int, key: str) -> int:
+        uid = self._check_credentials(scope='rpc', key=key)
+        if not uid:
+            # Raise rather than return, so that invalid keys are not cached
+            raise AccessDenied()
+        return uid
+
+    def unlink(self):
+        # Keys are only stored hashed, so the digests of the removed keys are
+        # unknown here: drop every cached validation, in all workers.
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    def _remove(self):
+        # Revoking a key from the UI deletes it in SQL, without going through unlink()
+        res = super()._remove()
+        self.env.registry.clear_cache()
+        return res
@@ -0,0 +1,67 @@
+import logging
+from typing import Dict, Iterable
+from odoo import models
+from odoo.tools.sql import column_exists, create_index, index_exists
+
+_logger = logging.getLogger(__name__)
+
+
+class SaleOrder(models.Model):
+    _inherit = 'sale.order'
+
+    def init(self):
+        """Index ``api_order_id``, unique unless the table already holds duplicates"""
+        super().init()
+        cr = self.env.cr
+        if not column_exists(cr, 'sale_order', 'api_order_id') or index_exists(cr, 'sale_order_api_order_id_uniq'):
+            return
+        cr.execute("""
+            SELECT api_order_id
+              FROM sale_order
+             WHERE api_order_id IS NOT NULL
+          GROUP BY api_order_id
+            HAVING COUNT(*) > 1
+             LIMIT 5
+        """)
+        duplicates = [row[0] for row in cr.fetchall()]
+        if duplicates:
+            _logger.warning(
+                "Sale orders share the same api_order_id (e.g. %s), creating a non-unique index instead of "
+                "sale_order_api_order_id_uniq", ', '.join(map(str, duplicates)))
+            create_index(cr, 'sale_order_api_order_id_index', 'sale_order', ['api_order_id'])
+            return
+        cr.execute("""
+            CREATE UNIQUE INDEX sale_order_api_order_id_uniq
+                ON sale_order (api_order_id)
+             WHERE api_order_id IS NOT NULL
+        """)
+
+    def write(self, vals):
+        res = super().write(vals)
+        # The delivery orders payload embeds the sale order
+        Snapshot = self.env['api.dispatch.snapshot']
+        if Snapshot._is_enabled():
+            Snapshot._mark_dirty(self.picking_ids.ids)
+        return res
+
+    def _api_find_by_api_order_ids(self, api_order_ids: Iterable[str]) -> Dict[str, int]:
+        """Exact-match lookup of sale order ids by ``api_order_id``, with a single indexed query.
+
+        When several orders share an ``api_order_id``, the first one in the
+        default order of sale orders is returned. Access rules are not
+        applied: callers run as superuser.
+        """
+        api_order_ids = list(set(api_order_ids))
+        if not api_order_ids:
+            return {}
+        self.flush_model(['api_order_id', 'date_order'])
+        self.env.cr.execute("""
+            SELECT api_order_id, id
+              FROM sale_order
+             WHERE api_order_id = ANY(%s)
+          ORDER BY date_order DESC, id DESC
+        """, [api_order_ids])
+        result = {}
+        for api_order_id, order_id in self.env.cr.fetchall():
+            result.setdefault(api_order_id, order_id)
+        return result
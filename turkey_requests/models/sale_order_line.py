@@ -0,0 +1,26 @@
+from odoo import models, api
+
+
+class SaleOrderLine(models.Model):
+    _inherit = 'sale.order.line'
+
+    def _mark_dispatch_snapshot_dirty(self) -> None:
+        """Refresh the dispatch snapshot rows of the deliveries of the orders, whose payload embeds the lines"""
+        Snapshot = self.env['api.dispatch.snapshot']
+        if Snapshot._is_enabled():
+            Snapshot._mark_dirty(self.order_id.picking_ids.ids)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        lines._mark_dispatch_snapshot_dirty()
+        return lines
+
+    def write(self, vals):
+        res = super().write(vals)
+        self._mark_dispatch_snapshot_dirty()
+        return res
+
+    def unlink(self):
+        self._mark_dispatch_snapshot_dirty()
+        return super().unlink()
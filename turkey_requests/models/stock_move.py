@@ -0,0 +1,34 @@
+from odoo import models, api
+
+
+class StockMove(models.Model):
+    _inherit = 'stock.move'
+
+    def _mark_dispatch_snapshot_dirty(self) -> None:
+        """Refresh the dispatch snapshot rows of the pickings of the moves, whose payload lists them"""
+        Snapshot = self.env['api.dispatch.snapshot']
+        if Snapshot._is_enabled():
+            Snapshot._mark_dirty(self.picking_id.ids)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # New moves may change the state of their pickings
+        Picking = self.env['stock.picking']
+        self.env['api.delivery.tombstone']._track_list_exits(
+            Picking.browse({vals['picking_id'] for vals in vals_list if vals.get('picking_id')}))
+        moves = super().create(vals_list)
+        moves._mark_dispatch_snapshot_dirty()
+        return moves
+
+    def write(self, vals):
+        # Before and after the write, in case the moves change picking
+        self.env['api.delivery.tombstone']._track_list_exits(self.picking_id)
+        self._mark_dispatch_snapshot_dirty()
+        res = super().write(vals)
+        self._mark_dispatch_snapshot_dirty()
+        return res
+
+    def unlink(self):
+        self.env['api.delivery.tombstone']._track_list_exits(self.picking_id)
+        self._mark_dispatch_snapshot_dirty()
+        return super().unlink()
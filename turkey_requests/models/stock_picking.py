@@ -0,0 +1,118 @@
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+from odoo import models, api
+from odoo.tools.sql import create_index
+
+_logger = logging.getLogger(__name__)
+
+# States a delivery order can be moved to through the API
+API_DELIVERY_STATES = ['draft', 'waiting', 'confirmed', 'assigned', 'done', 'cancel']
+# Number of pickings moved to a state at once, inside a single savepoint
+STATE_TRANSITION_CHUNK_SIZE = 50
+
+
+class StockPicking(models.Model):
+    _inherit = 'stock.picking'
+
+    def init(self):
+        """Index the delivery orders listed by the API: assigned for delivery, by type and scheduled date"""
+        super().init()
+        create_index(
+            self.env.cr, 'stock_picking_delivery_assign_scheduled_idx', self._table,
+            ['picking_type_id', 'scheduled_date', 'id'], where="state = 'delivery_assign'",
+        )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        pickings = super().create(vals_list)
+        self.env['api.dispatch.snapshot']._mark_dirty(pickings.ids)
+        return pickings
+
+    def write(self, vals):
+        self.env['api.delivery.tombstone']._track_list_exits(self)
+        res = super().write(vals)
+        self.env['api.dispatch.snapshot']._mark_dirty(self.ids)
+        return res
+
+    def unlink(self):
+        self.env['api.delivery.tombstone']._record_deletions(self)
+        return super().unlink()
+
+    def _api_apply_state(self, state: str) -> None:
+        """Move the pickings to ``state`` the way the delivery orders API does"""
+        if state == 'done':
+            self.button_validate()
+        elif state == 'cancel':
+            self.action_cancel()
+        else:
+            self.write({'state': state})
+
+    @api.model
+    def _api_apply_state_transitions(self, items: Iterable[Dict[str, Any]],
+                                     valid_states: Optional[List[str]] = None,
+                                     chunk_size: int = STATE_TRANSITION_CHUNK_SIZE) -> List[Dict[str, Any]]:
+        """Apply a list of ``{'id', 'state'}`` transitions and return one result per item, in order.
+
+        Items are grouped by target state and every group is applied by
+        chunks, each inside its own savepoint. When a chunk fails, its
+        pickings are retried one by one so that a single faulty picking only
+        fails its own item. An id listed more than once, whatever the target
+        states, is only applied for its first occurrence and the other ones
+        fail as duplicates.
+        """
+        results = []
+        by_state = defaultdict(list)
+        seen = set()
+        for item in items:
+            picking_id, state = item.get('id'), item.get('state')
+            if isinstance(picking_id, str) and picking_id.isdigit():
+                picking_id = int(picking_id)
+            result = {'id': picking_id, 'state': state, 'success': False}
+            results.append(result)
+            if not isinstance(picking_id, int) or isinstance(picking_id, bool):
+                result['error'] = 'Invalid id'
+            elif valid_states is not None and state not in valid_states:
+                result['error'] = f'Invalid state: {state}'
+            elif picking_id in seen:
+                result['error'] = 'Duplicate item'
+            else:
+                seen.add(picking_id)
+                by_state[state].append(result)
+
+        existing = set(self.browse({r['id'] for group in by_state.values() for r in group}).exists().ids)
+        for state, group in by_state.items():
+            pending = {}
+            for result in group:
+                if result['id'] not in existing:
+                    result['error'] = 'Delivery order not found'
+                else:
+                    pending[result['id']] = result
+            ids = list(pending)
+            for start in range(0, len(ids), chunk_size):
+                self._api_apply_state_chunk(self.browse(ids[start:start + chunk_size]), state, pending)
+        return results
+
+    def _api_apply_state_chunk(self, pickings, state: str, results: Dict[int, Dict[str, Any]]) -> None:
+        """Apply ``state`` to a chunk of pickings, falling back to one picking at a time on failure"""
+        try:
+            with self.env.cr.savepoint():
+                pickings._api_apply_state(state)
+        except Exception as e:
+            _logger.warning("Moving %s pickings to %s failed (%s), retrying them one by one", len(pickings), state, e)
+            for picking in pickings:
+                try:
+                    with self.env.cr.savepoint():
+                        picking._api_apply_state(state)
+                except Exception as error:
+                    results[picking.id]['error'] = str(error)
+        for picking in pickings:
+            result = results[picking.id]
+            if 'error' in result:
+                continue
+            result['new_state'] = picking.state
+            if picking.state == state:
+                result['success'] = True
+            else:
+                # e.g. button_validate() asking for a backorder or an immediate transfer
+                result['error'] = f'Delivery order is in state {picking.state}, user action required'
@@ -0,0 +1,2 @@
+from . import test_serializers
+from . import test_stock_picking
@@ -0,0 +1,116 @@
+import importlib.util
+import os
+import random
+import timeit
+
+# -----------------------------------------------------------------
+# Micro-benchmark: grouping pickings by assignee
+#
+# Compares the former per-assignee ``filtered`` scan, which is
+# O(assignees x pickings), with the real
+# DeliveryOrderSerializer.group_ids_by_assignee, loaded from
+# tools/serializers.py. The method runs on stub recordsets whose
+# ``read`` and ``browse`` work on in-memory rows, so no Odoo server
+# is needed. SQL and ORM cache costs are therefore not measured, only
+# the Python side of both strategies.
+# -----------------------------------------------------------------
+
+SERIALIZERS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools', 'serializers.py')
+
+
+def load_serializer_class():
+    spec = importlib.util.spec_from_file_location('turkey_requests_serializers', SERIALIZERS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.DeliveryOrderSerializer
+
+
+class StubField:
+    def __init__(self, comodel_name):
+        self.comodel_name = comodel_name
+
+
+class StubRecord:
+    __slots__ = ('id', 'assign_to', 'delivery_id')
+
+    def __init__(self, record_id, assign_to=None, delivery_id=False):
+        self.id = record_id
+        self.assign_to = assign_to
+        self.delivery_id = delivery_id
+
+
+class StubRecordset:
+    """The part of the recordset API used by both grouping strategies"""
+    _fields = {'assign_to': StubField('delivery.assignee')}
+
+    def __init__(self, records):
+        self.records = records
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def filtered(self, predicate):
+        return StubRecordset([record for record in self.records if predicate(record)])
+
+    def mapped(self, name):
+        return {getattr(record, name) for record in self.records}
+
+    def read(self, field_names, load='_classic_read'):
+        rows = []
+        for record in self.records:
+            row = {'id': record.id}
+            for name in field_names:
+                value = getattr(record, name)
+                row[name] = value.id if isinstance(value, StubRecord) else value
+            rows.append(row)
+        return rows
+
+
+class StubModel:
+    def __init__(self, records):
+        self.records = {record.id: record for record in records}
+
+    def browse(self, ids):
+        return StubRecordset([self.records[record_id] for record_id in ids])
+
+
+def make_pickings(assignee_count, picking_count, unassigned_ratio=0.05):
+    assignees = [StubRecord(assign_id, delivery_id=f'D{assign_id}') for assign_id in range(1, assignee_count + 1)]
+    pickings = []
+    for picking_id in range(1, picking_count + 1):
+        assign_to = None if random.random() < unassigned_ratio else random.choice(assignees)
+        pickings.append(StubRecord(picking_id, assign_to=assign_to))
+    return StubRecordset(pickings), {'delivery.assignee': StubModel(assignees)}
+
+
+def group_per_assignee_scan(pickings):
+    orders = []
+    assignees = pickings.filtered(lambda x: x.assign_to).mapped('assign_to')
+    for assign in assignees:
+        orders.append((
+            assign.delivery_id,
+            [picking.id for picking in pickings.filtered(lambda x: x.assign_to and x.assign_to.id == assign.id)],
+        ))
+    return orders
+
+
+def main():
+    random.seed(42)
+    DeliveryOrderSerializer = load_serializer_class()
+    print(f"{'assignees':>10} {'pickings':>10} {'scan (ms)':>12} {'single pass (ms)':>18} {'speedup':>9}")
+    for assignee_count, picking_count in [(10, 250), (50, 1000), (150, 4000), (300, 8000)]:
+        pickings, env = make_pickings(assignee_count, picking_count)
+        # The grouping only needs self.env, the product name languages are not read
+        serializer = DeliveryOrderSerializer(env, languages=[])
+        # Both strategies build the same groups, the former one dropped unassigned pickings
+        grouped = dict(serializer.group_ids_by_assignee(pickings))
+        grouped.pop(None, None)
+        assert grouped == dict(group_per_assignee_scan(pickings))
+        runs = 5
+        scan = timeit.timeit(lambda: group_per_assignee_scan(pickings), number=runs) / runs * 1000
+        single = timeit.timeit(lambda: serializer.group_ids_by_assignee(pickings), number=runs) / runs * 1000
+        print(f"{assignee_count:>10} {picking_count:>10} {scan:>12.2f} {single:>18.2f} {scan / single:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
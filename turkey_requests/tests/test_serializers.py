@@ -0,0 +1,123 @@
+from odoo.tests import TransactionCase, tagged
+
+from ..tools.encoding import json_dumps
+from ..tools.serializers import DeliveryOrderSerializer
+
+
+@tagged('post_install', '-at_install')
+class TestDeliveryOrderSerializer(TransactionCase):
+    """The set-based serializer must produce the same payloads as the former per-record walk"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env['res.lang']._activate_lang('ar_001')
+        country = cls.env['res.country'].create({'name': 'Test Country', 'code': 'ZZ'})
+        state = cls.env['res.country.state'].create({'name': 'Test State', 'code': 'TS', 'country_id': country.id})
+        cls.partner = cls.env['res.partner'].create({
+            'name': 'Test Customer',
+            'phone': '+966500000000',
+            'street': 'King Fahd Road',
+            'city': 'Riyadh',
+            'state_id': state.id,
+            'country_id': country.id,
+        })
+        cls.product = cls.env['product.product'].create({'name': 'Lamb', 'type': 'consu'})
+        cls.product.with_context(lang='ar_001').name = 'خروف'
+        cls.other_product = cls.env['product.product'].create({'name': 'Goat', 'type': 'consu'})
+
+        cls.sale_order = cls.env['sale.order'].create({
+            'partner_id': cls.partner.id,
+            'api_order_id': 'API-TEST-1',
+            'order_line': [
+                (0, 0, {'product_id': cls.product.id, 'product_uom_qty': 2, 'price_unit': 150.0}),
+                (0, 0, {'product_id': cls.other_product.id, 'product_uom_qty': 1, 'price_unit': 90.0}),
+            ],
+        })
+        cls.sale_order.action_confirm()
+        cls.picking = cls.sale_order.picking_ids[:1]
+        cls.picking.write({'long': 46.6753, 'lat': 24.7136})
+
+        # A picking without partner nor sale order
+        picking_type = cls.env.ref('stock.picking_type_out')
+        cls.lone_picking = cls.env['stock.picking'].create({
+            'picking_type_id': picking_type.id,
+            'location_id': picking_type.default_location_src_id.id,
+            'location_dest_id': cls.env.ref('stock.stock_location_customers').id,
+            'move_ids': [(0, 0, {
+                'name': cls.other_product.name,
+                'product_id': cls.other_product.id,
+                'product_uom_qty': 3,
+                'location_id': picking_type.default_location_src_id.id,
+                'location_dest_id': cls.env.ref('stock.stock_location_customers').id,
+            })],
+        })
+
+    def _legacy_sale_order_data(self, sale_order):
+        return {
+            'id': sale_order.id,
+            'name': sale_order.name,
+            'city': sale_order.city,
+            'order': sale_order.api_order_id,
+            'delivery_time': sale_order.delivery_time,
+            'payment_method': sale_order.payment_method,
+            'payment_status': sale_order.payment_status,
+            'delivery_period': sale_order.delivery_period,
+            'api_order_id': sale_order.api_order_id,
+            'date_order': sale_order.date_order.isoformat() if sale_order.date_order else None,
+            'partner_id': {
+                'id': sale_order.partner_id.id,
+                'name': sale_order.partner_id.name,
+                'phone': sale_order.partner_id.phone,
+                'address': sale_order.partner_id.street,
+                'state': sale_order.partner_id.state_id.name,
+                'city': sale_order.partner_id.city,
+                'country': sale_order.partner_id.country_id.name,
+            },
+            'state': sale_order.state,
+            'amount_total': sale_order.amount_total,
+            'order_lines': [{
+                'product_id': line.product_id.id,
+                'product_name': line.product_id.name,
+                'product_name_arabic': line.product_id.with_context(lang='ar_001').name,
+                'quantity': line.product_uom_qty,
+                'price_unit': line.price_unit,
+                'size': line.size,
+                'cut': line.cutting,
+                'preparation': line.preparation,
+                'shalwata': line.shalwata,
+                'subtotal': line.price_subtotal
+            } for line in sale_order.order_line]
+        }
+
+    def _legacy_picking_data(self, picking):
+        sale_order = picking.sale_id
+        return {
+            'id': picking.id,
+            'name': picking.name,
+            'partner': picking.partner_id.name,
+            'longitude': picking.long,
+            'latitude': picking.lat,
+            'delivery_state': picking.state,
+            'move_lines': [{
+                'product_id': line.product_id.id,
+                'product_name': line.product_id.name,
+                'product_name_arabic': line.product_id.with_context(lang='ar_001').name,
+                'quantity': line.product_uom_qty
+            } for line in picking.move_ids],
+            'sale_order': self._legacy_sale_order_data(sale_order) if sale_order else None,
+        }
+
+    def test_serialize_pickings_matches_legacy_walk(self):
+        pickings = self.picking | self.lone_picking
+        self.assertTrue(self.picking.move_ids and self.picking.sale_id)
+        serialized = DeliveryOrderSerializer(self.env, languages=['ar_001']).serialize_pickings(pickings)
+        for picking in pickings:
+            self.assertEqual(json_dumps(serialized[picking.id]), json_dumps(self._legacy_picking_data(picking)))
+
+    def test_serialize_sale_orders_matches_legacy_walk(self):
+        serialized = DeliveryOrderSerializer(self.env, languages=['ar_001']).serialize_sale_orders(self.sale_order)
+        self.assertEqual(
+            json_dumps(serialized[self.sale_order.id]),
+            json_dumps(self._legacy_sale_order_data(self.sale_order)),
+        )
@@ -0,0 +1,35 @@
+from odoo.tests import TransactionCase, tagged
+
+from ..models.stock_picking import API_DELIVERY_STATES
+
+
+@tagged('post_install', '-at_install')
+class TestApiStateTransitions(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        picking_type = cls.env.ref('stock.picking_type_out')
+        product = cls.env['product.product'].create({'name': 'Lamb', 'type': 'consu'})
+        locations = {
+            'location_id': picking_type.default_location_src_id.id,
+            'location_dest_id': cls.env.ref('stock.stock_location_customers').id,
+        }
+        # The state of a picking follows its moves
+        cls.picking = cls.env['stock.picking'].create({
+            'picking_type_id': picking_type.id,
+            **locations,
+            'move_ids': [(0, 0, {'name': product.name, 'product_id': product.id, 'product_uom_qty': 1, **locations})],
+        })
+
+    def test_repeated_id_applies_first_item_only(self):
+        results = self.env['stock.picking']._api_apply_state_transitions([
+            {'id': self.picking.id, 'state': 'cancel'},
+            {'id': str(self.picking.id), 'state': 'confirmed'},
+        ], valid_states=API_DELIVERY_STATES)
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(results[0]['success'])
+        self.assertFalse(results[1]['success'])
+        self.assertEqual(results[1]['error'], 'Duplicate item')
+        self.assertEqual(self.picking.state, 'cancel')
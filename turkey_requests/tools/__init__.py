@@ -0,0 +1,7 @@
+from . import encoding
+from . import endpoint_checks
+from . import http_sessions
+from . import indexes
+from . import log_buffer
+from . import profiler
+from . import serializers
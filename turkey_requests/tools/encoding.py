@@ -0,0 +1,88 @@
+import gzip
+import json
+import zlib
+from typing import Any, Iterable, Iterator, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Minimum body size (bytes) before a response gets compressed
+COMPRESSION_MIN_SIZE_PARAM = 'turkey_requests.compression_min_size'
+DEFAULT_COMPRESSION_MIN_SIZE = 1024
+
+
+def json_dumps(data: Any) -> bytes:
+    """Encode ``data`` as compact UTF-8 JSON, using orjson when it is installed.
+
+    Both encoders produce the same compact layout (no whitespace after
+    separators) so that chunks built separately, as in streamed responses,
+    can be concatenated into a valid document whatever the encoder.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers above 64 bits, let the standard library handle them
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best content coding supported by both the client and the server"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(','):
+        coding, _sep, params = item.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    supported = ['br', 'gzip'] if brotli is not None else ['gzip']
+    candidates = [coding for coding in supported if accepted.get(coding, accepted.get('*', 0)) > 0]
+    return candidates[0] if candidates else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a whole body with the negotiated content coding"""
+    if encoding == 'br':
+        return brotli.compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+def decompress(body: bytes, encoding: Optional[str]) -> bytes:
+    """Decode a body compressed by :func:`compress`"""
+    if encoding == 'br':
+        return brotli.decompress(body)
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    return body
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress a streamed body chunk by chunk with the negotiated content coding"""
+    if encoding == 'br':
+        compressor = brotli.Compressor()
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+    # wbits=31 writes the gzip header and trailer
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
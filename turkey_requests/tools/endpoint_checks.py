@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from .http_sessions import session_manager
+
+_logger = logging.getLogger(__name__)
+
+# Concurrency of the batch health checks of api.endpoints
+CHECK_WORKERS_PARAM = 'turkey_requests.endpoint_check_workers'
+CHECK_PER_HOST_PARAM = 'turkey_requests.endpoint_check_per_host'
+CHECK_DEADLINE_PARAM = 'turkey_requests.endpoint_check_deadline'
+DEFAULT_CHECK_WORKERS = 8
+DEFAULT_CHECK_PER_HOST = 2
+DEFAULT_CHECK_DEADLINE = 30.0
+# Timeout of a single call (seconds), capped by the time left before the deadline
+CALL_TIMEOUT = 10.0
+
+
+def check_endpoint(spec: Dict[str, Any], deadline: float, host_slots: threading.Semaphore,
+                   session_options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Call a single endpoint described by ``spec`` and return the outcome of the call.
+
+    Runs in a worker thread: ``spec`` only holds plain values read from the
+    endpoint record beforehand, no ORM access happens here. The call goes
+    through the pooled session of the host; its latency is split into the
+    time to the response headers, which includes the connection setup when
+    no pooled connection is available, and the time to download the body.
+    """
+    result = {
+        'endpoint_id': spec['id'], 'status': 'error', 'response_time': 0.0,
+        'time_to_first_byte': 0.0, 'transfer_time': 0.0, 'error_message': '',
+    }
+    if not host_slots.acquire(timeout=max(deadline - time.monotonic(), 0)):
+        result['error_message'] = 'Deadline exceeded while waiting for a connection slot'
+        return result
+    start_time = time.monotonic()
+    try:
+        timeout = min(CALL_TIMEOUT, deadline - start_time)
+        if timeout <= 0:
+            result['error_message'] = 'Deadline exceeded before the request was sent'
+            return result
+        session = session_manager.get(spec['url'], **(session_options or {}))
+        response = session.request(
+            spec['method'], spec['url'], headers=spec.get('headers'), data=spec.get('data'), auth=spec.get('auth'),
+            timeout=timeout, stream=True,
+        )
+        headers_time = time.monotonic()
+        # Reading the body releases the connection back to the pool
+        response.content
+        end_time = time.monotonic()
+        result.update(
+            response_time=(end_time - start_time) * 1000,
+            time_to_first_byte=(headers_time - start_time) * 1000,
+            transfer_time=(end_time - headers_time) * 1000,
+        )
+        if response.status_code == 200:
+            result['status'] = 'success'
+            _logger.info("Endpoint %s responded 200 OK.", spec['name'])
+        else:
+            result['error_message'] = f"HTTP {response.status_code}: {response.text}"
+            _logger.warning("Endpoint %s returned status %s.", spec['name'], response.status_code)
+    except Exception as ex:
+        result['error_message'] = str(ex)
+        result['response_time'] = (time.monotonic() - start_time) * 1000
+        _logger.error("Error calling endpoint %s: %s", spec['name'], result['error_message'])
+    finally:
+        host_slots.release()
+    return result
+
+
+def run_checks(specs: List[Dict[str, Any]], max_workers: int = DEFAULT_CHECK_WORKERS,
+               max_per_host: int = DEFAULT_CHECK_PER_HOST,
+               deadline_seconds: float = DEFAULT_CHECK_DEADLINE,
+               session_options: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Call all endpoints of ``specs`` concurrently and return one result per spec, in order.
+
+    At most ``max_workers`` calls run at the same time, and at most
+    ``max_per_host`` of them against the same host. Calls still pending
+    when the deadline is reached are reported as errors; the workers still
+    running are left to finish in the background. ``session_options`` are
+    passed to :meth:`~.http_sessions.SessionManager.get`.
+    """
+    if not specs:
+        return []
+    deadline = time.monotonic() + deadline_seconds
+    host_slots = {}
+    for spec in specs:
+        host = urlsplit(spec['url']).netloc.lower()
+        host_slots.setdefault(host, threading.Semaphore(max_per_host))
+
+    executor = ThreadPoolExecutor(max_workers=max(min(max_workers, len(specs)), 1),
+                                  thread_name_prefix='api_endpoint_check')
+    try:
+        futures = [
+            executor.submit(check_endpoint, spec, deadline, host_slots[urlsplit(spec['url']).netloc.lower()],
+                            session_options)
+            for spec in specs
+        ]
+        wait(futures, timeout=max(deadline - time.monotonic(), 0))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for spec, future in zip(specs, futures):
+        if future.done() and not future.cancelled():
+            results.append(future.result())
+        else:
+            _logger.warning("Endpoint %s check did not complete before the deadline.", spec['name'])
+            results.append({
+                'endpoint_id': spec['id'],
+                'status': 'error',
+                'response_time': deadline_seconds * 1000,
+                'time_to_first_byte': 0.0,
+                'transfer_time': 0.0,
+                'error_message': f'Deadline of {deadline_seconds:g}s exceeded',
+            })
+    return results
@@ -0,0 +1,68 @@
+import os
+import threading
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Outbound connection pooling of the api.endpoints checks
+POOL_SIZE_PARAM = 'turkey_requests.endpoint_pool_size'
+RETRIES_PARAM = 'turkey_requests.endpoint_retries'
+BACKOFF_PARAM = 'turkey_requests.endpoint_retry_backoff'
+DEFAULT_POOL_SIZE = 4
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.3
+# Transient statuses retried for idempotent methods
+RETRY_STATUSES = (502, 503, 504)
+
+
+class SessionManager:
+    """Per-process registry of keep-alive ``requests`` sessions, one per host.
+
+    Each session keeps a connection pool to its host, so consecutive calls
+    to the same host reuse the TCP/TLS connection instead of opening a new
+    one. Sessions are dropped when the process forks, as pooled sockets
+    cannot be shared between workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._sessions: Dict[Tuple, requests.Session] = {}
+
+    def get(self, url: str, pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES,
+            backoff: float = DEFAULT_BACKOFF) -> requests.Session:
+        """Return the pooled session to use for ``url``"""
+        parts = urlsplit(url)
+        key = (parts.scheme.lower(), parts.netloc.lower(), pool_size, retries, backoff)
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._sessions = {}
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = self._new_session(parts.scheme, pool_size, retries, backoff)
+            return session
+
+    def _new_session(self, scheme: str, pool_size: int, retries: int, backoff: float) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=retries, backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+                              raise_on_status=False),
+        )
+        session.mount(f'{scheme.lower()}://', adapter)
+        return session
+
+    def clear(self) -> None:
+        """Close and forget all sessions"""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+
+session_manager = SessionManager()
@@ -0,0 +1,49 @@
+import logging
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Indexes the API lookups rely on: (table, accepted index names). The first
+# name is the preferred one, the others are fallbacks serving the same lookups,
+# e.g. the plain api_order_id index created when duplicates prevent the unique one.
+API_INDEXES = [
+    ('sale_order', ('sale_order_api_order_id_uniq', 'sale_order_api_order_id_index')),
+    ('stock_picking', ('stock_picking_delivery_assign_scheduled_idx',)),
+    ('api_endpoint_calls', ('api_endpoint_calls__endpoint_id_index',)),
+]
+
+
+def check_indexes(cr) -> Dict[str, List[str]]:
+    """Report the API indexes missing from the database and those never used by a scan.
+
+    An index counts as present when any of its accepted names exists. Scan
+    counters come from ``pg_stat_user_indexes`` and accumulate since the
+    last statistics reset, so freshly created indexes always show as unused.
+    """
+    cr.execute("""
+        SELECT i.tablename, i.indexname, COALESCE(s.idx_scan, 0)
+          FROM pg_indexes i
+     LEFT JOIN pg_stat_user_indexes s ON s.indexrelname = i.indexname AND s.relname = i.tablename
+         WHERE i.schemaname = current_schema()
+           AND i.indexname IN %s
+    """, [tuple(name for _table, names in API_INDEXES for name in names)])
+    scans = {(table, name): scan_count for table, name, scan_count in cr.fetchall()}
+    report = {'missing': [], 'unused': []}
+    for table, names in API_INDEXES:
+        existing = [name for name in names if (table, name) in scans]
+        if not existing:
+            report['missing'].append(names[0])
+        report['unused'].extend(name for name in existing if scans[table, name] == 0)
+    return report
+
+
+def log_index_report(cr) -> Dict[str, List[str]]:
+    """Check the API indexes and log the missing and unused ones"""
+    report = check_indexes(cr)
+    if report['missing']:
+        _logger.warning("Missing indexes for the delivery orders API: %s", ', '.join(report['missing']))
+    if report['unused']:
+        _logger.info("Indexes of the delivery orders API never used yet: %s", ', '.join(report['unused']))
+    if not report['missing']:
+        _logger.info("All %s indexes of the delivery orders API are present", len(API_INDEXES))
+    return report
@@ -0,0 +1,147 @@
+import atexit
+import logging
+import os
+import threading
+from collections import Counter, defaultdict, deque
+from typing import Any, Dict, Optional
+
+import odoo
+from odoo import api
+from odoo.modules.registry import Registry
+
+_logger = logging.getLogger(__name__)
+
+# Maximum number of rows waiting in memory, further rows are dropped
+LOG_BUFFER_SIZE = 10000
+# Seconds between two flushes, a flush also starts as soon as a batch is full
+LOG_FLUSH_INTERVAL = 2.0
+LOG_BATCH_SIZE = 500
+
+
+class ApiLogBuffer:
+    """Bounded in-memory queue of API log rows written by a background thread.
+
+    Request handlers only append the values of the rows to create; the
+    flusher batch-inserts them with one ``create`` per database and model, in
+    its own cursor. Log inserts are thus off the request latency path and are
+    not rolled back together with a failing request.
+    """
+
+    def __init__(self, maxsize: int = LOG_BUFFER_SIZE, flush_interval: float = LOG_FLUSH_INTERVAL,
+                 batch_size: int = LOG_BATCH_SIZE):
+        self.maxsize = maxsize
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._reset()
+
+    def _reset(self) -> None:
+        """(Re)initialize the per-process state, e.g. after a fork"""
+        self._pid = os.getpid()
+        self._pending = deque()
+        self._thread = None
+        self.dropped = Counter()
+        self.flushed = Counter()
+        self.failed = Counter()
+        self._reported_drops = 0
+
+    def _ensure_thread(self) -> None:
+        """Start the flusher thread of the current process if needed"""
+        if self._pid != os.getpid():
+            self._reset()
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='api_log_buffer', daemon=True)
+            self._thread.start()
+
+    def append(self, dbname: str, model: Optional[str], vals: Optional[Dict[str, Any]],
+               sample: Optional[tuple] = None) -> bool:
+        """Queue a row to create in ``model``, return False if the queue is full and the row is dropped.
+
+        ``sample`` is an optional ``(endpoint, timestamp, status, duration_ms)``
+        tuple folded into the traffic metrics rollups when the row is flushed.
+        ``model`` and ``vals`` may be None to only queue a sample.
+        """
+        with self._lock:
+            self._ensure_thread()
+            if len(self._pending) >= self.maxsize:
+                self.dropped[model or 'api.metrics.rollup'] += 1
+                return False
+            self._pending.append((dbname, model, vals, sample))
+            if len(self._pending) >= self.batch_size:
+                self._wakeup.set()
+        return True
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return the queue length and the per-model flushed, failed and dropped counters"""
+        with self._lock:
+            return {
+                'queued': len(self._pending),
+                'flushed': dict(self.flushed),
+                'failed': dict(self.failed),
+                'dropped': dict(self.dropped),
+            }
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                _logger.exception("Unexpected error while flushing API logs")
+
+    def flush(self) -> None:
+        """Write every queued row, with one ``create`` per database and model"""
+        with self._lock:
+            pending, self._pending = self._pending, deque()
+            dropped = sum(self.dropped.values())
+        if dropped > self._reported_drops:
+            self._reported_drops = dropped
+            _logger.warning("API log buffer full, %s rows dropped so far: %s", dropped, dict(self.dropped))
+        if not pending:
+            return
+
+        grouped = defaultdict(list)
+        samples = defaultdict(list)
+        for dbname, model, vals, sample in pending:
+            if model:
+                grouped[(dbname, model)].append(vals)
+            if sample:
+                samples[dbname].append(sample)
+
+        for (dbname, model), vals_list in grouped.items():
+            try:
+                with Registry(dbname).cursor() as cr:
+                    env = api.Environment(cr, odoo.SUPERUSER_ID, {})
+                    try:
+                        with cr.savepoint():
+                            env[model].create(vals_list)
+                        self.flushed[model] += len(vals_list)
+                    except Exception:
+                        # Isolate the faulty rows instead of losing the whole batch
+                        self._create_one_by_one(env, model, vals_list)
+            except Exception:
+                self.failed[model] += len(vals_list)
+                _logger.exception("Could not write %s rows in %s", len(vals_list), model)
+
+        for dbname, db_samples in samples.items():
+            try:
+                with Registry(dbname).cursor() as cr:
+                    api.Environment(cr, odoo.SUPERUSER_ID, {})['api.metrics.rollup']._add_samples(db_samples)
+            except Exception:
+                _logger.exception("Could not update the API metrics rollups with %s samples", len(db_samples))
+
+    def _create_one_by_one(self, env, model: str, vals_list) -> None:
+        for vals in vals_list:
+            try:
+                with env.cr.savepoint():
+                    env[model].create(vals)
+                self.flushed[model] += 1
+            except Exception:
+                self.failed[model] += 1
+                _logger.exception("Could not write API log row in %s: %s", model, vals)
+
+
+api_log_buffer = ApiLogBuffer()
+atexit.register(api_log_buffer.flush)
@@ -0,0 +1,85 @@
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Tuple
+
+# Profiling of the API routes, see controllers/instrumentation.py
+PROFILER_ENABLED_PARAM = 'turkey_requests.profiler_enabled'
+# Keep the profile of requests slower than this (ms), 0 to disable
+PROFILER_THRESHOLD_PARAM = 'turkey_requests.profiler_threshold_ms'
+# Share of requests (0.0 - 1.0) profiled whatever their duration
+PROFILER_SAMPLE_RATE_PARAM = 'turkey_requests.profiler_sample_rate'
+# Interval between two stack samples (ms)
+PROFILER_INTERVAL_PARAM = 'turkey_requests.profiler_interval_ms'
+DEFAULT_PROFILER_THRESHOLD_MS = 1000
+DEFAULT_PROFILER_INTERVAL_MS = 5
+
+
+def _frame_location(code) -> str:
+    """Short ``package/module.py:function`` label of a code object"""
+    path = code.co_filename.split(os.sep)
+    return f"{'/'.join(path[-2:])}:{code.co_name}"
+
+
+class StackSampler:
+    """Low-overhead sampling profiler of a single thread.
+
+    A daemon thread snapshots the stack of the profiled thread every
+    ``interval`` seconds; the profiled code itself is not traced, so its
+    overhead does not depend on the number of Python calls it makes.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> 'StackSampler':
+        self._thread = threading.Thread(target=self._run, name='api_stack_sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append((_frame_location(frame.f_code), frame.f_lineno))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def _function_counts(self) -> Tuple[Counter, Counter]:
+        """Return the inclusive and self sample counts of every function"""
+        inclusive, own = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            for location in {location for location, _line in stack}:
+                inclusive[location] += count
+            location, line = stack[-1]
+            own[f'{location}:{line}'] += count
+        return inclusive, own
+
+    def report(self, limit: int = 30) -> str:
+        """Render the profile as text: top functions and collapsed stacks (flame graph format)"""
+        total = sum(self.stacks.values())
+        if not total:
+            return 'No sample collected, the request was shorter than the sampling interval.'
+        inclusive, own = self._function_counts()
+        lines = [f'{total} samples, one every {self.interval * 1000:.0f} ms', '', 'Top functions (inclusive):']
+        lines += [f'{count * 100 / total:6.1f}% {count:6d}  {location}' for location, count in inclusive.most_common(limit)]
+        lines += ['', 'Top lines (self):']
+        lines += [f'{count * 100 / total:6.1f}% {count:6d}  {location}' for location, count in own.most_common(limit)]
+        lines += ['', 'Collapsed stacks:']
+        lines += [
+            ';'.join(f'{location}:{line}' for location, line in stack) + f' {count}'
+            for stack, count in self.stacks.most_common(limit)
+        ]
+        return '\n'.join(lines)
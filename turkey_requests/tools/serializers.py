@@ -0,0 +1,272 @@
+from typing import Dict, Any, Iterable, List, Optional
+
+PICKING_FIELDS = ['name', 'partner_id', 'long', 'lat', 'state', 'move_ids', 'sale_id', 'assign_to']
+MOVE_FIELDS = ['product_id', 'product_uom_qty']
+SALE_ORDER_FIELDS = [
+    'name', 'city', 'api_order_id', 'delivery_time', 'payment_method', 'payment_status',
+    'delivery_period', 'date_order', 'partner_id', 'state', 'amount_total', 'order_line',
+]
+SALE_ORDER_LINE_FIELDS = [
+    'product_id', 'product_uom_qty', 'price_unit', 'size', 'cutting', 'preparation',
+    'shalwata', 'price_subtotal',
+]
+PARTNER_FIELDS = ['name', 'phone', 'street', 'state_id', 'city', 'country_id']
+# Keys of a sale order payload, in order, and the sale.order field each one is built from
+SALE_ORDER_PAYLOAD_FIELDS = {
+    'id': None,
+    'name': 'name',
+    'city': 'city',
+    'order': 'api_order_id',
+    'delivery_time': 'delivery_time',
+    'payment_method': 'payment_method',
+    'payment_status': 'payment_status',
+    'delivery_period': 'delivery_period',
+    'api_order_id': 'api_order_id',
+    'date_order': 'date_order',
+    'partner_id': 'partner_id',
+    'state': 'state',
+    'amount_total': 'amount_total',
+    'order_lines': 'order_line',
+}
+
+# Languages whose product names are added to move and order lines
+PRODUCT_NAME_LANGS_PARAM = 'turkey_requests.product_name_languages'
+DEFAULT_PRODUCT_NAME_LANGS = 'ar_001'
+# Payload keys kept for backward compatibility, others are named product_name_<lang>
+PRODUCT_NAME_KEYS = {'ar_001': 'product_name_arabic'}
+
+
+def read_by_id(records, field_names: List[str]) -> Dict[int, Dict[str, Any]]:
+    """Read ``field_names`` for the whole recordset at once, keyed by record id.
+
+    Relational values are loaded as raw ids (``load=None``) so that no
+    ``display_name`` is computed for the related records.
+    """
+    if not records:
+        return {}
+    return {row['id']: row for row in records.read(field_names, load=None)}
+
+
+def get_sale_order_keys(fields: Optional[Iterable[str]] = None) -> List[str]:
+    """Return the sale order payload keys to build for a ``fields`` projection, all of them by default.
+
+    :raise ValueError: if a requested key is not part of the sale order payload
+    """
+    if not fields:
+        return list(SALE_ORDER_PAYLOAD_FIELDS)
+    unknown = set(fields) - set(SALE_ORDER_PAYLOAD_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown sale order fields: {', '.join(sorted(unknown))}")
+    return [key for key in SALE_ORDER_PAYLOAD_FIELDS if key in fields or key == 'id']
+
+
+class DeliveryOrderSerializer:
+    """Set-based serializer for the delivery orders API payloads.
+
+    Every model involved in a payload is read once for the whole recordset
+    and the nested JSON structure is assembled from the resulting dicts, so
+    the number of queries does not grow with the number of pickings.
+    """
+
+    def __init__(self, env, languages: Optional[List[str]] = None):
+        self.env = env
+        self.languages = languages if languages is not None else self._get_product_name_languages()
+        # Per-request map of product id -> {payload key: name}
+        self.product_names = {}
+
+    def _get_product_name_languages(self) -> List[str]:
+        """Return the configured languages for translated product names"""
+        param = self.env['ir.config_parameter'].sudo().get_param(
+            PRODUCT_NAME_LANGS_PARAM, DEFAULT_PRODUCT_NAME_LANGS)
+        return [lang.strip() for lang in param.split(',') if lang.strip()]
+
+    def _load_product_names(self, product_ids: Iterable[int]) -> None:
+        """Fill the product name map for all products not loaded yet.
+
+        The translated ``name`` column holds every language, so the names in
+        the context language and in all configured languages are fetched
+        with a single query whatever the number of languages.
+        """
+        missing = set(product_ids) - set(self.product_names) - {False}
+        if not missing:
+            return
+        self.env['product.product'].flush_model(['product_tmpl_id'])
+        self.env['product.template'].flush_model(['name'])
+        self.env.cr.execute("""
+            SELECT pp.id, pt.name
+              FROM product_product pp
+              JOIN product_template pt ON pt.id = pp.product_tmpl_id
+             WHERE pp.id IN %s
+        """, [tuple(missing)])
+        context_lang = self.env.lang or 'en_US'
+        for product_id, name in self.env.cr.fetchall():
+            names = {'product_name': self._translate(name, context_lang)}
+            for lang in self.languages:
+                names[PRODUCT_NAME_KEYS.get(lang, f'product_name_{lang}')] = self._translate(name, lang)
+            self.product_names[product_id] = names
+
+    def _translate(self, value, lang: str):
+        """Resolve a translated column value the way the ORM does, falling back to en_US"""
+        if not isinstance(value, dict):
+            return value
+        return value[lang] if value.get(lang) is not None else value.get('en_US')
+
+    def _product_name_data(self, product_id) -> Dict[str, Any]:
+        """Return the product name keys of a move or order line payload"""
+        names = self.product_names.get(product_id)
+        if names is None:
+            names = dict.fromkeys(
+                ['product_name'] + [PRODUCT_NAME_KEYS.get(lang, f'product_name_{lang}') for lang in self.languages],
+                False,
+            )
+        return names
+
+    def _read_sale_orders(self, sale_orders, keys: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Read all the records needed to build the ``keys`` of the ``sale_orders`` payloads.
+
+        Partners, their states and countries are only read for ``partner_id``,
+        order lines and their products only for ``order_lines``.
+        """
+        keys = keys or list(SALE_ORDER_PAYLOAD_FIELDS)
+        field_names = sorted({SALE_ORDER_PAYLOAD_FIELDS[key] for key in keys} - {None})
+        if field_names:
+            orders = read_by_id(sale_orders, field_names)
+        else:
+            # read([]) would read every field, ids are all that is needed
+            orders = {order_id: {'id': order_id} for order_id in sale_orders.ids}
+        lines, partners, states, countries = {}, {}, {}, {}
+        if 'order_lines' in keys:
+            line_ids = [line_id for order in orders.values() for line_id in order['order_line']]
+            lines = read_by_id(self.env['sale.order.line'].browse(line_ids), SALE_ORDER_LINE_FIELDS)
+        if 'partner_id' in keys:
+            partners = read_by_id(
+                self.env['res.partner'].browse({order['partner_id'] for order in orders.values() if order['partner_id']}),
+                PARTNER_FIELDS,
+            )
+            states = read_by_id(
+                self.env['res.country.state'].browse({p['state_id'] for p in partners.values() if p['state_id']}),
+                ['name'],
+            )
+            countries = read_by_id(
+                self.env['res.country'].browse({p['country_id'] for p in partners.values() if p['country_id']}),
+                ['name'],
+            )
+        return {
+            'keys': keys,
+            'orders': orders,
+            'lines': lines,
+            'partners': partners,
+            'states': states,
+            'countries': countries,
+        }
+
+    def _build_sale_orders(self, data: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+        """Assemble the sale order payloads from the data of :meth:`_read_sale_orders`"""
+        return {
+            order_id: {key: self._sale_order_value(key, order_id, order, data) for key in data['keys']}
+            for order_id, order in data['orders'].items()
+        }
+
+    def _sale_order_value(self, key: str, order_id: int, order: Dict[str, Any], data: Dict[str, Any]) -> Any:
+        """Build the value of a single key of a sale order payload"""
+        if key == 'id':
+            return order_id
+        if key == 'date_order':
+            return order['date_order'].isoformat() if order['date_order'] else None
+        if key == 'partner_id':
+            partner = data['partners'].get(order['partner_id'], {})
+            return {
+                'id': order['partner_id'],
+                'name': partner.get('name', False),
+                'phone': partner.get('phone', False),
+                'address': partner.get('street', False),
+                'state': data['states'].get(partner.get('state_id'), {}).get('name', False),
+                'city': partner.get('city', False),
+                'country': data['countries'].get(partner.get('country_id'), {}).get('name', False),
+            }
+        if key == 'order_lines':
+            return [self._order_line_data(data['lines'][line_id]) for line_id in order['order_line']]
+        return order[SALE_ORDER_PAYLOAD_FIELDS[key]]
+
+    def serialize_sale_orders(self, sale_orders, fields: Optional[Iterable[str]] = None) -> Dict[int, Dict[str, Any]]:
+        """Serialize sale orders, keyed by sale order id, restricted to the ``fields`` payload keys if given"""
+        data = self._read_sale_orders(sale_orders, get_sale_order_keys(fields))
+        self._load_product_names(line['product_id'] for line in data['lines'].values())
+        return self._build_sale_orders(data)
+
+    def _order_line_data(self, line: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the payload of a single sale order line"""
+        return {
+            'product_id': line['product_id'],
+            **self._product_name_data(line['product_id']),
+            'quantity': line['product_uom_qty'],
+            'price_unit': line['price_unit'],
+            'size': line['size'],
+            'cut': line['cutting'],
+            'preparation': line['preparation'],
+            'shalwata': line['shalwata'],
+            'subtotal': line['price_subtotal'],
+        }
+
+    def serialize_pickings(self, pickings) -> Dict[int, Dict[str, Any]]:
+        """Serialize delivery orders, keyed by picking id"""
+        rows = read_by_id(pickings, PICKING_FIELDS)
+        move_ids = [move_id for row in rows.values() for move_id in row['move_ids']]
+        moves = read_by_id(self.env['stock.move'].browse(move_ids), MOVE_FIELDS)
+        partners = read_by_id(
+            self.env['res.partner'].browse({row['partner_id'] for row in rows.values() if row['partner_id']}),
+            ['name'],
+        )
+        sale_order_data = self._read_sale_orders(
+            self.env['sale.order'].browse({row['sale_id'] for row in rows.values() if row['sale_id']})
+        )
+        # One product name lookup shared by the move lines and the order lines
+        self._load_product_names(
+            [move['product_id'] for move in moves.values()]
+            + [line['product_id'] for line in sale_order_data['lines'].values()]
+        )
+        sale_orders = self._build_sale_orders(sale_order_data)
+
+        result = {}
+        for picking_id, row in rows.items():
+            result[picking_id] = {
+                'id': picking_id,
+                'name': row['name'],
+                'partner': partners.get(row['partner_id'], {}).get('name', False),
+                'longitude': row['long'],
+                'latitude': row['lat'],
+                'delivery_state': row['state'],
+                'move_lines': [self._move_line_data(moves[move_id]) for move_id in row['move_ids']],
+                'sale_order': sale_orders.get(row['sale_id']),
+            }
+        return result
+
+    def _move_line_data(self, move: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the payload of a single stock move"""
+        return {
+            'product_id': move['product_id'],
+            **self._product_name_data(move['product_id']),
+            'quantity': move['product_uom_qty'],
+        }
+
+    def group_ids_by_assignee(self, pickings) -> List[tuple]:
+        """Split ``pickings`` by assignee in a single pass, without serializing them.
+
+        Returns ``(assign_to, picking_ids)`` pairs in the order in which the
+        assignees first appear in the recordset. Unassigned pickings are
+        collected in a trailing pair whose ``assign_to`` is None.
+        """
+        groups = {}
+        unassigned = []
+        for row in pickings.read(['assign_to'], load=None):
+            if row['assign_to']:
+                groups.setdefault(row['assign_to'], []).append(row['id'])
+            else:
+                unassigned.append(row['id'])
+
+        Assignee = self.env[pickings._fields['assign_to'].comodel_name]
+        assignees = read_by_id(Assignee.browse(groups), ['delivery_id'])
+        result = [(assignees[assign_id]['delivery_id'], ids) for assign_id, ids in groups.items()]
+        if unassigned:
+            result.append((None, unassigned))
+        return result